@@ -23,6 +23,14 @@ TABLE_ORDERS = "Restaurant_Orders"
 TABLE_MENU = "Restaurant_Menu"
 TABLE_NOTIFICATIONS = "Restaurant_Notifications"
 
+# Waitlist/notification tables are partitioned on shardKey = "<prefix>-<n>"
+# so bursts of writes spread over WAITLIST_SHARD_COUNT partition keys
+# The shard is derived from the item ID, so this is fixed: changing it moves
+# every existing row out of reach of GetItem until the tables are re-seeded
+WAITLIST_SHARD_COUNT = 20
+WAITLIST_SHARD_PREFIX = "wl"
+NOTIFICATION_SHARD_PREFIX = "nt"
+
 # Bedrock Model Configuration
 MODEL_ID = "amazon.nova-sonic-v1:0"
 MODEL_MAX_TOKENS = 1024
@@ -52,6 +60,12 @@ WAIT_TIME_XLARGE_PARTY = (45, 90)  # party size > 6
 # Table Capacity Buffer
 TABLE_CAPACITY_BUFFER = 2  # Allow tables up to party_size + 2
 
+# DynamoDB Write Retry Configuration
+WRITE_MAX_RETRIES = 5
+WRITE_BACKOFF_BASE_SECONDS = 0.05
+WRITE_BACKOFF_MAX_SECONDS = 1.0
+WRITE_RETRYABLE_ERRORS = ("ProvisionedThroughputExceededException", "ThrottlingException")
+
 # Tax Rate
 TAX_RATE = 0.08  # 8%
 
@@ -3,6 +3,7 @@ Settings Module
 Environment-based configuration for the restaurant agent
 """
 import os
+import functools
 from dataclasses import dataclass
 from typing import Optional
 from config.constants import *
@@ -52,13 +53,7 @@ class RestaurantConfig:
         )
 
 
-# Global configuration instance
-_config: Optional[RestaurantConfig] = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_config() -> RestaurantConfig:
     """Get the global configuration instance (singleton pattern)"""
-    global _config
-    if _config is None:
-        _config = RestaurantConfig.from_env()
-    return _config
+    return RestaurantConfig.from_env()
@@ -41,12 +41,12 @@ from tools import (
 class RestaurantToolProcessor:
     """Handles all restaurant voice agent tools with DynamoDB integration"""
 
-    def __init__(self):
+    def __init__(self, dynamodb=None):
         self.tasks = {}
         config = get_config()
 
-        # Initialize DynamoDB
-        self.dynamodb = boto3.resource("dynamodb", region_name=config.aws_region)
+        # Initialize DynamoDB (reuse the caller's resource when one is supplied)
+        self.dynamodb = dynamodb or boto3.resource("dynamodb", region_name=config.aws_region)
 
         # Initialize all tools
         self.tools = {
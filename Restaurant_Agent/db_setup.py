@@ -3,6 +3,9 @@ import datetime
 import time
 from decimal import Decimal
 
+from tools.waitlist_tools import waitlist_key, notification_key
+
+
 def setup_restaurant_demo_data():
     """
     Sets up DynamoDB tables for a restaurant voice agent.
@@ -18,8 +21,14 @@ def setup_restaurant_demo_data():
             'AttributeDefinitions': [{'AttributeName': 'reservationId', 'AttributeType': 'S'}]
         },
         'Restaurant_Waitlist': {
-            'KeySchema': [{'AttributeName': 'waitlistId', 'KeyType': 'HASH'}],
-            'AttributeDefinitions': [{'AttributeName': 'waitlistId', 'AttributeType': 'S'}]
+            'KeySchema': [
+                {'AttributeName': 'shardKey', 'KeyType': 'HASH'},
+                {'AttributeName': 'waitlistId', 'KeyType': 'RANGE'}
+            ],
+            'AttributeDefinitions': [
+                {'AttributeName': 'shardKey', 'AttributeType': 'S'},
+                {'AttributeName': 'waitlistId', 'AttributeType': 'S'}
+            ]
         },
         'Restaurant_Tables': {
             'KeySchema': [{'AttributeName': 'tableId', 'KeyType': 'HASH'}],
@@ -38,8 +47,14 @@ def setup_restaurant_demo_data():
             'AttributeDefinitions': [{'AttributeName': 'itemId', 'AttributeType': 'S'}]
         },
         'Restaurant_Notifications': {
-            'KeySchema': [{'AttributeName': 'notificationId', 'KeyType': 'HASH'}],
-            'AttributeDefinitions': [{'AttributeName': 'notificationId', 'AttributeType': 'S'}]
+            'KeySchema': [
+                {'AttributeName': 'shardKey', 'KeyType': 'HASH'},
+                {'AttributeName': 'notificationId', 'KeyType': 'RANGE'}
+            ],
+            'AttributeDefinitions': [
+                {'AttributeName': 'shardKey', 'AttributeType': 'S'},
+                {'AttributeName': 'notificationId', 'AttributeType': 'S'}
+            ]
         }
     }
 
@@ -261,7 +276,7 @@ def setup_restaurant_demo_data():
 
     # Waitlist entry 1: Walk-in waiting for table (active)
     waitlist.put_item(Item={
-        'waitlistId': 'WAIT-20260127-001',
+        **waitlist_key('WAIT-20260127-001'),
         'customerId': None,
         'customerName': 'Jennifer Martinez',
         'phone': '+1-555-567-8901',
@@ -281,7 +296,7 @@ def setup_restaurant_demo_data():
     # Waitlist entry 2: Requested tomorrow 7 PM but it's fully booked
     tomorrow_7pm = datetime.datetime.combine(tomorrow, datetime.time(19, 0))
     waitlist.put_item(Item={
-        'waitlistId': 'WAIT-20260128-001',
+        **waitlist_key('WAIT-20260128-001'),
         'customerId': 'CUST-10004',
         'customerName': 'Michael Thompson',
         'phone': '+1-555-456-7890',
@@ -365,7 +380,7 @@ def setup_restaurant_demo_data():
 
     # Pending notification for waitlist customer
     notifications.put_item(Item={
-        'notificationId': 'NOTIF-20260127-001',
+        **notification_key('NOTIF-20260127-001'),
         'waitlistId': 'WAIT-20260127-001',
         'phone': '+1-555-567-8901',
         'customerName': 'Jennifer Martinez',
@@ -10,6 +10,7 @@ import asyncio
 import boto3
 import warnings
 from config.settings import get_config
+from utils.logging import reset_debug
 from core.tool_processor import RestaurantToolProcessor
 from streaming.bedrock_manager import BedrockStreamManager
 from streaming.audio_streamer import AudioStreamer
@@ -24,6 +25,7 @@ async def main(debug=False):
     # Get configuration and set debug mode
     config = get_config()
     config.debug_mode = debug
+    reset_debug()
 
     print("\n" + "="*60)
     print("🍽️  Restaurant Voice Agent - Reservation Assistant")
@@ -65,6 +65,7 @@ def get_tool_schemas():
     join_waitlist_schema = {
         "type": "object",
         "properties": {
+            "customerId": {"type": "string", "description": "Optional: existing customer ID, if already known"},
             "customerName": {"type": "string"},
             "phone": {"type": "string"},
             "partySize": {"type": "integer"},
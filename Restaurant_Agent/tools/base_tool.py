@@ -2,9 +2,31 @@
 Base Tool
 Abstract base class for all restaurant tools
 """
+import random
+import time
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+from botocore.exceptions import ClientError
+from config.constants import (
+    WRITE_MAX_RETRIES,
+    WRITE_BACKOFF_BASE_SECONDS,
+    WRITE_BACKOFF_MAX_SECONDS,
+    WRITE_RETRYABLE_ERRORS,
+)
+
+# Table handles shared by every tool, keyed by (id(resource), table name).
+# The resource is kept in the value so its id cannot be reused while cached.
+_TABLES: Dict[Tuple[int, str], Tuple[Any, Any]] = {}
+
+
+def get_table(dynamodb, name: str):
+    """Return a cached boto3 Table handle for the given resource and table name"""
+    key = (id(dynamodb), name)
+    cached = _TABLES.get(key)
+    if cached is None:
+        cached = _TABLES.setdefault(key, (dynamodb, dynamodb.Table(name)))
+    return cached[1]
 
 
 class BaseTool(ABC):
@@ -19,6 +41,10 @@ class BaseTool(ABC):
         """
         self.dynamodb = dynamodb
 
+    def _table(self, name: str):
+        """Get a shared Table handle for this tool's DynamoDB resource"""
+        return get_table(self.dynamodb, name)
+
     def convert_decimals(self, obj: Any) -> Any:
         """
         Recursively convert Decimal objects to strings for JSON serialization
@@ -38,6 +64,30 @@ class BaseTool(ABC):
         else:
             return obj
 
+    def _write_with_backoff(self, table, item: Dict[str, Any], max_retries: int = WRITE_MAX_RETRIES, **kwargs):
+        """
+        Put an item, retrying throttled writes with jittered exponential backoff
+
+        Args:
+            table: boto3 DynamoDB Table to write to
+            item: Item to put
+            max_retries: Retries allowed after the first attempt
+            **kwargs: Extra put_item arguments (e.g. ConditionExpression)
+
+        Returns:
+            The put_item response
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                return table.put_item(Item=item, **kwargs)
+            except ClientError as e:
+                if attempt == max_retries or e.response.get("Error", {}).get("Code") not in WRITE_RETRYABLE_ERRORS:
+                    raise
+                time.sleep(
+                    min(WRITE_BACKOFF_BASE_SECONDS * 2 ** attempt, WRITE_BACKOFF_MAX_SECONDS)
+                    + random.random() * WRITE_BACKOFF_BASE_SECONDS
+                )
+
     @abstractmethod
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -15,7 +15,7 @@ class ViewMenuTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.menu_table = dynamodb.Table(TABLE_MENU)
+        self.menu_table = self._table(TABLE_MENU)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
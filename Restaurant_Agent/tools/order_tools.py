@@ -18,9 +18,9 @@ class PlaceOrderTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.reservations_table = dynamodb.Table(TABLE_RESERVATIONS)
-        self.orders_table = dynamodb.Table(TABLE_ORDERS)
-        self.menu_table = dynamodb.Table(TABLE_MENU)
+        self.reservations_table = self._table(TABLE_RESERVATIONS)
+        self.orders_table = self._table(TABLE_ORDERS)
+        self.menu_table = self._table(TABLE_MENU)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -118,7 +118,7 @@ class CheckOrderStatusTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.orders_table = dynamodb.Table(TABLE_ORDERS)
+        self.orders_table = self._table(TABLE_ORDERS)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
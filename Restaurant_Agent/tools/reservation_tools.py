@@ -18,7 +18,7 @@ class LookupReservationTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.reservations_table = dynamodb.Table(TABLE_RESERVATIONS)
+        self.reservations_table = self._table(TABLE_RESERVATIONS)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -95,9 +95,9 @@ class CreateReservationTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.reservations_table = dynamodb.Table(TABLE_RESERVATIONS)
-        self.customers_table = dynamodb.Table(TABLE_CUSTOMERS)
-        self.tables_table = dynamodb.Table(TABLE_TABLES)
+        self.reservations_table = self._table(TABLE_RESERVATIONS)
+        self.customers_table = self._table(TABLE_CUSTOMERS)
+        self.tables_table = self._table(TABLE_TABLES)
 
     def _find_available_table(self, party_size, preferences):
         """
@@ -240,7 +240,7 @@ class EditReservationTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.reservations_table = dynamodb.Table(TABLE_RESERVATIONS)
+        self.reservations_table = self._table(TABLE_RESERVATIONS)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -343,7 +343,7 @@ class CancelReservationTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.reservations_table = dynamodb.Table(TABLE_RESERVATIONS)
+        self.reservations_table = self._table(TABLE_RESERVATIONS)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -400,7 +400,7 @@ class ConfirmReservationTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.reservations_table = dynamodb.Table(TABLE_RESERVATIONS)
+        self.reservations_table = self._table(TABLE_RESERVATIONS)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -5,6 +5,7 @@ Tools for managing guest seating
 import datetime
 from typing import Dict, Any
 from tools.base_tool import BaseTool
+from tools.waitlist_tools import waitlist_key
 from config.constants import TABLE_RESERVATIONS, TABLE_WAITLIST
 
 
@@ -16,8 +17,8 @@ class SeatGuestTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.reservations_table = dynamodb.Table(TABLE_RESERVATIONS)
-        self.waitlist_table = dynamodb.Table(TABLE_WAITLIST)
+        self.reservations_table = self._table(TABLE_RESERVATIONS)
+        self.waitlist_table = self._table(TABLE_WAITLIST)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -54,14 +55,14 @@ class SeatGuestTool(BaseTool):
 
             else:
                 # Seat from waitlist
-                response = self.waitlist_table.get_item(Key={'waitlistId': waitlist_id})
+                response = self.waitlist_table.get_item(Key=waitlist_key(waitlist_id))
                 if 'Item' not in response:
                     return {"found": False, "message": "Waitlist entry not found."}
 
                 entry = response['Item']
 
                 self.waitlist_table.update_item(
-                    Key={'waitlistId': waitlist_id},
+                    Key=waitlist_key(waitlist_id),
                     UpdateExpression="SET #status = :seated, seatedAt = :now",
                     ExpressionAttributeNames={'#status': 'status'},
                     ExpressionAttributeValues={
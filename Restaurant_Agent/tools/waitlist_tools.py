@@ -2,23 +2,83 @@
 Waitlist Tools
 Tools for managing restaurant waitlist
 """
+import bisect
 import datetime
+import os
 import random
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from boto3.dynamodb.conditions import Attr
 from tools.base_tool import BaseTool
+from utils.logging import debug_print
 from config.constants import (
     TABLE_WAITLIST,
     TABLE_CUSTOMERS,
     TABLE_NOTIFICATIONS,
     WAITLIST_ID_PREFIX,
     NOTIFICATION_ID_PREFIX,
+    WAITLIST_SHARD_COUNT,
+    WAITLIST_SHARD_PREFIX,
+    NOTIFICATION_SHARD_PREFIX,
     WAIT_TIME_SMALL_PARTY,
     WAIT_TIME_MEDIUM_PARTY,
     WAIT_TIME_LARGE_PARTY,
     WAIT_TIME_XLARGE_PARTY,
 )
 
+# Upper party-size bound for each wait range; the last bucket catches everything larger
+_WAIT_THRESHOLDS = (2, 4, 6)
+_WAIT_RANGES = (
+    WAIT_TIME_SMALL_PARTY,
+    WAIT_TIME_MEDIUM_PARTY,
+    WAIT_TIME_LARGE_PARTY,
+    WAIT_TIME_XLARGE_PARTY,
+)
+
+
+# Single background worker that links new waitlist entries to customer records
+_BACKFILL_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="waitlist-backfill")
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _new_ulid():
+    """
+    Generate a ULID: 48-bit millisecond timestamp + 80 random bits, Crockford base32.
+    IDs sort by creation time and are unique without a collision check.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    chars = []
+    for _ in range(26):
+        value, index = divmod(value, 32)
+        chars.append(_CROCKFORD_BASE32[index])
+    return "".join(reversed(chars))
+
+
+def _shard_key(prefix, item_id):
+    """Derive the partition shard for an item from its ID (stable, so reads need no fan-out)"""
+    return f"{prefix}-{zlib.crc32(item_id.encode()) % WAITLIST_SHARD_COUNT}"
+
+
+def waitlist_key(waitlist_id):
+    """Primary key of a waitlist entry: (shardKey, waitlistId)"""
+    return {'shardKey': _shard_key(WAITLIST_SHARD_PREFIX, waitlist_id), 'waitlistId': waitlist_id}
+
+
+def notification_key(notification_id):
+    """Primary key of a notification: (shardKey, notificationId)"""
+    return {'shardKey': _shard_key(NOTIFICATION_SHARD_PREFIX, notification_id), 'notificationId': notification_id}
+
+
+def _wait_minutes(party_size):
+    """
+    Calculate estimated wait time based on party size.
+    In production, this would analyze current table turnover rates.
+    """
+    return random.randint(*_WAIT_RANGES[bisect.bisect_left(_WAIT_THRESHOLDS, party_size)])
+
 
 class JoinWaitlistTool(BaseTool):
     """
@@ -27,25 +87,25 @@ class JoinWaitlistTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.waitlist_table = dynamodb.Table(TABLE_WAITLIST)
-        self.customers_table = dynamodb.Table(TABLE_CUSTOMERS)
-
-    def _calculate_wait_time(self, party_size):
-        """
-        Calculate estimated wait time based on current occupancy.
-        In production, this would analyze current table turnover rates.
-        """
-        if party_size <= 2:
-            return random.randint(*WAIT_TIME_SMALL_PARTY)
-        elif party_size <= 4:
-            return random.randint(*WAIT_TIME_MEDIUM_PARTY)
-        elif party_size <= 6:
-            return random.randint(*WAIT_TIME_LARGE_PARTY)
-        else:
-            return random.randint(*WAIT_TIME_XLARGE_PARTY)
+        self.waitlist_table = self._table(TABLE_WAITLIST)
+        self.customers_table = self._table(TABLE_CUSTOMERS)
+
+    def _backfill_customer_id(self, waitlist_id, phone):
+        """Set customerId on a waitlist entry if the phone matches a known customer"""
+        try:
+            customer_response = self.customers_table.scan(FilterExpression=Attr('phone').eq(phone))
+            if customer_response.get('Items'):
+                self.waitlist_table.update_item(
+                    Key=waitlist_key(waitlist_id),
+                    UpdateExpression="SET customerId = :customerId",
+                    ExpressionAttributeValues={':customerId': customer_response['Items'][0]['customerId']}
+                )
+        except Exception as e:
+            debug_print(f"Customer backfill failed for {waitlist_id}: {e}")
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
+            customer_id = content_data.get("customerId")  # Optional, skips the phone lookup
             customer_name = content_data.get("customerName")
             phone = content_data.get("phone")
             party_size = content_data.get("partySize")
@@ -61,38 +121,41 @@ class JoinWaitlistTool(BaseTool):
                 return {"error": "Missing required fields: customerName, phone, partySize"}
 
             # Create waitlist entry
-            waitlist_id = f"{WAITLIST_ID_PREFIX}-{datetime.datetime.now().strftime('%Y%m%d')}-{random.randint(100, 999):03d}"
+            now = datetime.datetime.now()
+            waitlist_id = f"{WAITLIST_ID_PREFIX}-{_new_ulid()}"
 
             # Calculate estimated wait for walk-ins
             estimated_wait = None
             if waitlist_type == "Walk-in":
-                estimated_wait = self._calculate_wait_time(party_size)
-
-            # Try to find existing customer
-            customer_id = None
-            customer_response = self.customers_table.scan(FilterExpression=Attr('phone').eq(phone))
-            if customer_response.get('Items'):
-                customer_id = customer_response['Items'][0]['customerId']
+                estimated_wait = _wait_minutes(party_size)
 
             waitlist_entry = {
-                'waitlistId': waitlist_id,
+                **waitlist_key(waitlist_id),
                 'customerId': customer_id,
                 'customerName': customer_name,
                 'phone': phone,
                 'partySize': party_size,
-                'requestedDate': requested_date or datetime.date.today().strftime('%Y-%m-%d'),
+                'requestedDate': requested_date or now.date().isoformat(),
                 'requestedTime': requested_time,
                 'type': waitlist_type,
                 'status': 'Waiting',
                 'estimatedWaitMinutes': estimated_wait,
-                'quotedAt': datetime.datetime.now().isoformat(),
+                'quotedAt': now.isoformat(),
                 'highChairNeeded': high_chair_needed,
                 'accessibilityNeeded': accessibility_needed,
                 'seatingPreference': seating_preference,
                 'notificationSent': False
             }
 
-            self.waitlist_table.put_item(Item=waitlist_entry)
+            self._write_with_backoff(
+                self.waitlist_table,
+                waitlist_entry,
+                ConditionExpression='attribute_not_exists(waitlistId)'
+            )
+
+            # Link to an existing customer after responding rather than before
+            if not customer_id:
+                _BACKFILL_EXECUTOR.submit(self._backfill_customer_id, waitlist_id, phone)
 
             message = f"You've been added to the waitlist, {customer_name}. Your waitlist number is {waitlist_id}."
             if estimated_wait:
@@ -120,17 +183,6 @@ class CheckWaitTimeTool(BaseTool):
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
 
-    def _calculate_wait_time(self, party_size):
-        """Calculate wait time based on party size"""
-        if party_size <= 2:
-            return random.randint(*WAIT_TIME_SMALL_PARTY)
-        elif party_size <= 4:
-            return random.randint(*WAIT_TIME_MEDIUM_PARTY)
-        elif party_size <= 6:
-            return random.randint(*WAIT_TIME_LARGE_PARTY)
-        else:
-            return random.randint(*WAIT_TIME_XLARGE_PARTY)
-
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             party_size = content_data.get("partySize")
@@ -139,7 +191,7 @@ class CheckWaitTimeTool(BaseTool):
                 return {"error": "partySize is required to check wait time."}
 
             # Calculate wait time
-            estimated_wait = self._calculate_wait_time(party_size)
+            estimated_wait = _wait_minutes(party_size)
 
             return {
                 "estimatedWaitMinutes": estimated_wait,
@@ -159,8 +211,8 @@ class NotifyTableReadyTool(BaseTool):
 
     def __init__(self, dynamodb):
         super().__init__(dynamodb)
-        self.waitlist_table = dynamodb.Table(TABLE_WAITLIST)
-        self.notifications_table = dynamodb.Table(TABLE_NOTIFICATIONS)
+        self.waitlist_table = self._table(TABLE_WAITLIST)
+        self.notifications_table = self._table(TABLE_NOTIFICATIONS)
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -170,16 +222,16 @@ class NotifyTableReadyTool(BaseTool):
                 return {"error": "waitlistId is required."}
 
             # Get waitlist entry
-            response = self.waitlist_table.get_item(Key={'waitlistId': waitlist_id})
+            response = self.waitlist_table.get_item(Key=waitlist_key(waitlist_id))
             if 'Item' not in response:
                 return {"found": False, "message": "Waitlist entry not found."}
 
             entry = response['Item']
 
             # Create notification
-            notification_id = f"{NOTIFICATION_ID_PREFIX}-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+            notification_id = f"{NOTIFICATION_ID_PREFIX}-{_new_ulid()}"
             notification = {
-                'notificationId': notification_id,
+                **notification_key(notification_id),
                 'waitlistId': waitlist_id,
                 'phone': entry['phone'],
                 'customerName': entry['customerName'],
@@ -189,11 +241,11 @@ class NotifyTableReadyTool(BaseTool):
                 'sentAt': None
             }
 
-            self.notifications_table.put_item(Item=notification)
+            self._write_with_backoff(self.notifications_table, notification)
 
             # Update waitlist entry
             self.waitlist_table.update_item(
-                Key={'waitlistId': waitlist_id},
+                Key=waitlist_key(waitlist_id),
                 UpdateExpression="SET notificationSent = :true, #status = :ready",
                 ExpressionAttributeNames={'#status': 'status'},
                 ExpressionAttributeValues={
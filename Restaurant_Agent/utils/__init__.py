@@ -2,7 +2,7 @@
 Utils Module
 Utility functions for logging and timing
 """
-from utils.logging import debug_print
+from utils.logging import debug_print, reset_debug
 from utils.timing import time_it, time_it_async
 
-__all__ = ["debug_print", "time_it", "time_it_async"]
+__all__ = ["debug_print", "reset_debug", "time_it", "time_it_async"]
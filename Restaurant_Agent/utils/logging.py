@@ -2,17 +2,26 @@
 Logging Utilities
 Debug printing with timestamps and function names
 """
-import inspect
+import sys
 import datetime
 from config.settings import get_config
 
+# Snapshot of the debug flag so the disabled path is a single global load
+_DEBUG = get_config().debug_mode
+
+
+def reset_debug():
+    """Re-read the debug flag after the configuration has been changed"""
+    global _DEBUG
+    _DEBUG = get_config().debug_mode
+
 
 def debug_print(message):
     """Print only if debug mode is enabled"""
-    config = get_config()
-    if config.debug_mode:
-        function_name = inspect.stack()[1].function
-        if function_name == "time_it" or function_name == "time_it_async":
-            function_name = inspect.stack()[2].function
-        timestamp = "{:%Y-%m-%d %H:%M:%S.%f}".format(datetime.datetime.now())[:-3]
-        print(f"{timestamp} {function_name} {message}")
+    if not _DEBUG:
+        return
+    function_name = sys._getframe(1).f_code.co_name
+    if function_name == "time_it" or function_name == "time_it_async":
+        function_name = sys._getframe(2).f_code.co_name
+    timestamp = "{:%Y-%m-%d %H:%M:%S.%f}".format(datetime.datetime.now())[:-3]
+    print(f"{timestamp} {function_name} {message}")
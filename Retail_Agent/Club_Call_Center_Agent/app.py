@@ -1,6 +1,10 @@
 import ast
+import os
+import re
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
@@ -10,18 +14,46 @@ from streamlit_autorefresh import st_autorefresh
 DEFAULT_LOG_PATH = "assistant.log"
 MAX_EVENTS = 300
 
-# Strings that indicate a tool usage line
-TOOL_KEYWORDS = [
-    "tooluse",
-    "tool_use",
-    "tool call",
-    "tool_call",
-    "tool:",
-    "tool :",
-    "tool use:",
-    "tool use :",
-    "toolinvocation",
-]
+# Tool keyword -> (background, icon, label); the first keyword in the message wins
+_HOURS = ("#1e3a8a", "🕒", "Store Hours")  # Blue for hours
+_INVENTORY = ("#065f46", "📦", "Inventory Check")  # Green for inventory
+_CURBSIDE = ("#7c2d12", "🚗", "Curbside Order")  # Orange for curbside
+_APPOINTMENT = ("#831843", "📅", "Appointment")  # Pink for appointments
+_SPECIALTY = ("#581c87", "🎂", "Specialty Order")  # Purple for cakes
+_VERIFY = ("#064e3b", "✅", "Member Verification")  # Dark green for verification
+TOOL_STYLES = {
+    "store": _HOURS,
+    "hours": _HOURS,
+    "inventory": _INVENTORY,
+    "stock": _INVENTORY,
+    "curbside": _CURBSIDE,
+    "order": _CURBSIDE,
+    "appointment": _APPOINTMENT,
+    "schedule": _APPOINTMENT,
+    "cake": _SPECIALTY,
+    "specialty": _SPECIALTY,
+    "verify": _VERIFY,
+    "member": _VERIFY,
+}
+DEFAULT_TOOL_STYLE = ("#374151", "🔧", "Tool")  # Default gray
+_TOOL_TAG_RE = re.compile("|".join(map(re.escape, TOOL_STYLES)), re.IGNORECASE)
+
+# Markers of a tool usage line: toolUse, tool_call, tool call, toolInvocation,
+# "tool:" / "tool use:" (matched case-insensitively)
+_TOOL_RE = re.compile(r"tool(?:_?use|[ _]call|invocation| ?:| use ?:)", re.IGNORECASE)
+
+# Leading labels stripped from tool lines by extract_tool_message
+_TOOL_PREFIXES = ("tool:", "tool use:", "tool use", "tool call:", "tool call")
+
+# UsageEvent lines are logged as a dict repr. These pull out the handful of
+# fields the viewer shows (the cumulative 'total' counts, not the 'delta')
+# without building the whole dict; parse_usage_dict is the fallback.
+_USAGE_RE = re.compile(
+    r"'completionId':\s*'(?P<completion_id>[^']*)'"
+    r".*?'total':\s*\{'input':\s*\{(?P<input>[^}]*)\},\s*'output':\s*\{(?P<output>[^}]*)\}"
+    r".*?'totalTokens':\s*(?P<total_tokens>\d+)"
+)
+_TOKEN_COUNT_RE = re.compile(r"'(?:speech|text)Tokens':\s*(\d+)")
 
 
 # --------------- PARSING ---------------
@@ -47,30 +79,46 @@ def parse_usage_dict(text: str) -> Optional[Dict[str, Any]]:
         d = ast.literal_eval(text[start:])
     except Exception:
         return None
-    return d
+    return d if isinstance(d, dict) else None
 
 
 def is_tool_line(text: str) -> bool:
     """Heuristic: does this line look like tool usage?"""
-    lower = text.lower()
-    return any(k in lower for k in TOOL_KEYWORDS)
+    return _TOOL_RE.search(text) is not None
+
 
+def extract_tool_message(text: str, lower: Optional[str] = None) -> str:
+    """Try to strip leading 'Tool:' or similar; otherwise return full text.
 
-def extract_tool_message(text: str) -> str:
-    """Try to strip leading 'Tool:' or similar; otherwise return full text."""
-    stripped = text.strip()
-    lower = stripped.lower()
+    Callers that already hold the stripped text and its lowercase form can
+    pass ``lower`` to skip recomputing both.
+    """
+    if lower is None:
+        text = text.strip()
+        lower = text.lower()
 
-    for prefix in ["tool:", "tool use:", "tool use", "tool call:", "tool call"]:
-        if lower.startswith(prefix):
-            parts = stripped.split(":", 1)
-            if len(parts) == 2:
-                return parts[1].strip() or stripped
-    return stripped
+    if lower.startswith(_TOOL_PREFIXES):
+        parts = text.split(":", 1)
+        if len(parts) == 2:
+            return parts[1].strip() or text
+    return text
 
 
 def parse_line_to_event(line: str) -> Optional[Dict[str, Any]]:
     """Convert a single log line into a structured event."""
+    fields = _parse_line_cached(line)
+    return dict(fields) if fields is not None else None
+
+
+@lru_cache(maxsize=8192)
+def _parse_line_cached(line: str) -> Optional[Tuple[Tuple[str, Any], ...]]:
+    """Memoized parse; events are cached as item tuples so callers can't mutate them."""
+    ev = _parse_line(line)
+    return tuple(ev.items()) if ev is not None else None
+
+
+def _parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Classify one raw log line (uncached)."""
     line = line.rstrip("\n")
     if not line:
         return None
@@ -99,7 +147,7 @@ def parse_line_to_event(line: str) -> Optional[Dict[str, Any]]:
         return {
             "type": "tool",
             "time": None,
-            "message": extract_tool_message(stripped),
+            "message": extract_tool_message(stripped, stripped.lower()),
         }
 
     # Timestamped lines
@@ -125,29 +173,37 @@ def parse_line_to_event(line: str) -> Optional[Dict[str, Any]]:
         return {
             "type": "tool",
             "time": ts,
-            "message": extract_tool_message(rest),
+            "message": extract_tool_message(rest, rest.lower()),
         }
 
     # Usage events
     if "UsageEvent:" in rest:
-        usage_dict = parse_usage_dict(rest)
         input_tokens = output_tokens = total_tokens = None
         completion_id = None
 
-        if usage_dict and "usageEvent" in usage_dict:
-            ue = usage_dict["usageEvent"]
-            completion_id = ue.get("completionId")
-            total = ue.get("details", {}).get("total", {})
-            inp = total.get("input", {})
-            out = total.get("output", {})
-
-            input_tokens = (inp.get("speechTokens", 0) or 0) + (
-                inp.get("textTokens", 0) or 0
-            )
-            output_tokens = (out.get("speechTokens", 0) or 0) + (
-                out.get("textTokens", 0) or 0
-            )
-            total_tokens = ue.get("totalTokens")
+        m = _USAGE_RE.search(rest)
+        if m:
+            completion_id = m.group("completion_id")
+            input_tokens = sum(map(int, _TOKEN_COUNT_RE.findall(m.group("input"))))
+            output_tokens = sum(map(int, _TOKEN_COUNT_RE.findall(m.group("output"))))
+            total_tokens = int(m.group("total_tokens"))
+        else:
+            # Unexpected layout: fall back to a full parse of the dict
+            usage_dict = parse_usage_dict(rest)
+            if usage_dict and "usageEvent" in usage_dict:
+                ue = usage_dict["usageEvent"]
+                completion_id = ue.get("completionId")
+                total = ue.get("details", {}).get("total", {})
+                inp = total.get("input", {})
+                out = total.get("output", {})
+
+                input_tokens = (inp.get("speechTokens", 0) or 0) + (
+                    inp.get("textTokens", 0) or 0
+                )
+                output_tokens = (out.get("speechTokens", 0) or 0) + (
+                    out.get("textTokens", 0) or 0
+                )
+                total_tokens = ue.get("totalTokens")
 
         return {
             "type": "usage",
@@ -180,25 +236,47 @@ def parse_line_to_event(line: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def parse_log_file(
-    path: str, limit: Optional[int] = MAX_EVENTS
-) -> List[Dict[str, Any]]:
-    """Read the log and turn it into a list of structured events."""
-    events: List[Dict[str, Any]] = []
+def tail_log_file(path: str, state) -> List[Dict[str, Any]]:
+    """Parse only the lines appended to the log since the previous refresh.
 
+    The read offset and the last MAX_EVENTS events are kept in ``state``
+    (normally ``st.session_state``). Rotation or truncation of the log
+    resets the tail to the start of the new file.
+    """
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                ev = parse_line_to_event(line)
-                if ev is not None:
-                    events.append(ev)
+        stat = os.stat(path)
     except FileNotFoundError:
         return []
 
-    if limit is not None and len(events) > limit:
-        events = events[-limit:]
+    tail = state.get("log_tail")
+    if (
+        tail is None
+        or tail["path"] != path
+        or tail["inode"] != stat.st_ino
+        or stat.st_size < tail["offset"]
+    ):
+        tail = {
+            "path": path,
+            "inode": stat.st_ino,
+            "offset": 0,
+            "events": deque(maxlen=MAX_EVENTS),
+        }
+        state["log_tail"] = tail
+
+    if stat.st_size > tail["offset"]:
+        with open(path, "rb") as f:
+            f.seek(tail["offset"])
+            chunk = f.read()
 
-    return events
+        # Only consume complete lines; a partial last line is re-read next time
+        end = chunk.rfind(b"\n") + 1
+        tail["offset"] += end
+        for line in chunk[:end].decode("utf-8", errors="ignore").split("\n"):
+            ev = parse_line_to_event(line)
+            if ev is not None:
+                tail["events"].append(ev)
+
+    return list(tail["events"])
 
 
 # --------------- STREAMLIT UI ---------------
@@ -234,14 +312,24 @@ if not log_file.exists():
     st.error(f"Log file not found at: `{log_file.resolve()}`")
     st.stop()
 
-events = parse_log_file(str(log_file), limit=MAX_EVENTS)
+events = tail_log_file(str(log_file), st.session_state)
 
 if not events:
     st.warning("No parsed conversation events yet. Waiting for calls...")
     st.stop()
 
-usage_events = [e for e in events if e["type"] == "usage"]
-chat_events = [e for e in events if e["type"] in ("user", "assistant", "event", "tool")]
+# Bucket events in a single pass
+usage_events, chat_events, tool_events, caller_interactions = [], [], [], []
+for e in events:
+    etype = e["type"]
+    if etype == "usage":
+        usage_events.append(e)
+        continue
+    chat_events.append(e)
+    if etype == "tool":
+        tool_events.append(e)
+    elif etype == "user":
+        caller_interactions.append(e)
 
 # ---- SUMMARY ----
 st.markdown("### 📊 Call Center Metrics")
@@ -251,7 +339,6 @@ with cols[0]:
     st.metric("Total Events", len(events))
 
 with cols[1]:
-    tool_events = [e for e in chat_events if e["type"] == "tool"]
     st.metric("Tool Calls", len(tool_events))
 
 with cols[2]:
@@ -262,7 +349,6 @@ with cols[2]:
         st.metric("Total Tokens", "–")
 
 with cols[3]:
-    caller_interactions = [e for e in chat_events if e["type"] == "user"]
     st.metric("Caller Messages", len(caller_interactions))
 
 st.markdown("---")
@@ -270,85 +356,57 @@ st.markdown("---")
 # ---- MAIN CONVERSATION VIEW ----
 st.markdown("### 💬 Live Call Transcripts")
 
+# Build the whole transcript and hand it to Streamlit in one element
+html_parts = []
 for ev in chat_events:
     etype = ev["type"]
     time_str = ev.get("time") or ""
 
     if etype == "user":
-        st.markdown(
+        html_parts.append(
             f"""
 <div style="padding: 10px 14px; margin-bottom: 10px; border-radius: 10px; background-color: #1e3a8a; border-left: 4px solid #3b82f6;">
   <div style="font-size: 0.75rem; opacity: 0.8; color: #93c5fd;">📞 Caller{(" • " + time_str) if time_str else ""}</div>
   <div style="margin-top: 6px; color: #e0e7ff; font-size: 0.95rem;">{ev['message']}</div>
 </div>
-""",
-            unsafe_allow_html=True,
+"""
         )
 
     elif etype == "assistant":
-        st.markdown(
+        html_parts.append(
             f"""
 <div style="padding: 10px 14px; margin-bottom: 10px; border-radius: 10px; background-color: #0f172a; border-left: 4px solid #64748b;">
   <div style="font-size: 0.75rem; opacity: 0.8; color: #94a3b8;">🎙️ Agent{(" • " + time_str) if time_str else ""}</div>
   <div style="margin-top: 6px; color: #cbd5e1; font-size: 0.95rem;">{ev['message']}</div>
 </div>
-""",
-            unsafe_allow_html=True,
+"""
         )
 
     elif etype == "tool":
         # Highlight different tool types with colors
-        tool_msg = ev['message'].lower()
-
-        if 'store' in tool_msg or 'hours' in tool_msg:
-            bg_color = "#1e3a8a"  # Blue for hours
-            icon = "🕒"
-            label = "Store Hours"
-        elif 'inventory' in tool_msg or 'stock' in tool_msg:
-            bg_color = "#065f46"  # Green for inventory
-            icon = "📦"
-            label = "Inventory Check"
-        elif 'curbside' in tool_msg or 'order' in tool_msg:
-            bg_color = "#7c2d12"  # Orange for curbside
-            icon = "🚗"
-            label = "Curbside Order"
-        elif 'appointment' in tool_msg or 'schedule' in tool_msg:
-            bg_color = "#831843"  # Pink for appointments
-            icon = "📅"
-            label = "Appointment"
-        elif 'cake' in tool_msg or 'specialty' in tool_msg:
-            bg_color = "#581c87"  # Purple for cakes
-            icon = "🎂"
-            label = "Specialty Order"
-        elif 'verify' in tool_msg or 'member' in tool_msg:
-            bg_color = "#064e3b"  # Dark green for verification
-            icon = "✅"
-            label = "Member Verification"
-        else:
-            bg_color = "#374151"  # Default gray
-            icon = "🔧"
-            label = "Tool"
+        m = _TOOL_TAG_RE.search(ev['message'])
+        bg_color, icon, label = TOOL_STYLES[m.group(0).lower()] if m else DEFAULT_TOOL_STYLE
 
-        st.markdown(
+        html_parts.append(
             f"""
 <div style="padding: 8px 12px; margin-bottom: 8px; border-radius: 8px; background-color: {bg_color}; border-left: 3px solid rgba(255,255,255,0.3);">
   <div style="font-size: 0.75rem; opacity: 0.85; color: #d1d5db;">{icon} {label}{(" • " + time_str) if time_str else ""}</div>
   <div style="font-size: 0.88rem; margin-top: 4px; color: #f3f4f6; font-family: monospace;">{ev['message']}</div>
 </div>
-""",
-            unsafe_allow_html=True,
+"""
         )
 
     elif etype == "event" and show_events:
-        st.markdown(
+        html_parts.append(
             f"""
 <div style="font-size: 0.72rem; opacity: 0.5; margin: 4px 0; color: #6b7280;">
   ⚡ Event: {ev.get('label', 'Event')}{(" • " + time_str) if time_str else ""}
 </div>
-""",
-            unsafe_allow_html=True,
+"""
         )
 
+st.markdown("\n".join(html_parts), unsafe_allow_html=True)
+
 # ---- USAGE (DROPDOWN) ----
 if usage_events:
     st.markdown("---")
@@ -7,12 +7,17 @@ All business logic has been extracted into separate modules.
 """
 import os
 import asyncio
-import boto3
 import warnings
 from config.settings import get_config
 from core.tool_processor import CallCenterToolProcessor
 from streaming.bedrock_manager import BedrockStreamManager
 from streaming.audio_streamer import AudioStreamer
+from utils.logging import debug_print
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows); asyncio's loop is the fallback
+    uvloop = None
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -25,16 +30,17 @@ async def main(debug=False):
     config = get_config()
     config.debug_mode = debug
 
+    # Make the active loop visible so a silent fallback from uvloop shows up
+    loop = asyncio.get_running_loop()
+    debug_print(f"Event loop: {type(loop).__module__}.{type(loop).__name__}")
+
     print("\n" + "="*60)
     print("📞 Club Call Center Agent - Voice Assistant")
     print("="*60)
     print("\nInitializing connection to AWS Bedrock...")
 
-    # Initialize DynamoDB
-    dynamodb = boto3.resource("dynamodb", region_name=config.aws_region)
-
-    # Initialize tool processor
-    tool_processor = CallCenterToolProcessor(dynamodb)
+    # Initialize tool processor (uses the shared DynamoDB resource)
+    tool_processor = CallCenterToolProcessor()
 
     # Initialize stream manager
     stream_manager = BedrockStreamManager(tool_processor)
@@ -44,16 +50,14 @@ async def main(debug=False):
     audio_streamer = AudioStreamer(stream_manager)
     await audio_streamer.start()
 
-    # Run both stream processing and audio output concurrently
+    # Response audio is written straight to the player; only stream events need running
     try:
-        await asyncio.gather(
-            stream_manager.process_stream_events(),
-            audio_streamer.play_output_audio(),
-        )
+        await stream_manager.process_stream_events()
     except KeyboardInterrupt:
         print("\n\nShutting down call center agent...")
     finally:
         await audio_streamer.stop()
+        await tool_processor.close()
 
 
 if __name__ == "__main__":
@@ -70,4 +74,7 @@ if __name__ == "__main__":
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
     args = parser.parse_args()
 
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     asyncio.run(main(debug=args.debug))
@@ -10,19 +10,66 @@ OUTPUT_SAMPLE_RATE = 24000
 CHANNELS = 1
 AUDIO_FORMAT = pyaudio.paInt16
 CHUNK_SIZE = 1024
+BYTES_PER_FRAME = 2 * CHANNELS  # 16-bit PCM
+
+# Max queued microphone chunks merged into one audioInput event
+AUDIO_INPUT_MAX_BATCH = 4
+
+# Stream queue bounds
+AUDIO_INPUT_QUEUE_MAXSIZE = 64
+OUTPUT_QUEUE_MAXSIZE = 256
 
 # AWS Configuration
 DEFAULT_AWS_REGION = "us-east-1"
 
+# DynamoDB Client Configuration
+DYNAMODB_MAX_POOL_CONNECTIONS = 64
+DYNAMODB_MAX_ATTEMPTS = 3
+
+# Worker threads for blocking tool execute() calls
+TOOL_EXECUTOR_WORKERS = 4
+
+# Attempts at a fresh random ID when a new order/appointment ID collides
+CREATE_ID_MAX_ATTEMPTS = 3
+
+# How long the cached current date/weekday is reused
+TODAY_CACHE_TTL_SECONDS = 1.0
+
+# In-process cache for read-only tool lookups
+TOOL_CACHE_MAXSIZE = 1024
+TOOL_CACHE_TTL_SECONDS = 60
+
+# Store records change rarely; cache them longer than tool results
+STORE_INFO_CACHE_MAXSIZE = 64
+STORE_INFO_CACHE_TTL_SECONDS = 300
+
+# GetItem coalescing into BatchGetItem
+BATCH_GET_WINDOW_SECONDS = 0.005
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_ATTEMPTS = 3
+# Longest a tool thread waits on a batch before doing its own GetItem
+BATCH_GET_RESULT_TIMEOUT_SECONDS = 2.0
+
 # DynamoDB Table Names
 TABLE_MEMBERS = "CallCenter_Members"
 TABLE_STORE_INFO = "CallCenter_Store_Info"
 TABLE_INVENTORY = "CallCenter_Inventory"
+TABLE_INVENTORY_SEARCH = "CallCenter_Inventory_Search"
 TABLE_CURBSIDE_ORDERS = "CallCenter_Curbside_Orders"
 TABLE_APPOINTMENTS = "CallCenter_Appointments"
 TABLE_SPECIALTY_ORDERS = "CallCenter_Specialty_Orders"
 TABLE_CAKE_ORDERS = "CallCenter_Cake_Orders"
 
+# Global secondary index on memberId, sorted by the record's date
+# (orderDate for curbside, appointmentDate for appointments, pickupDate for specialty orders)
+INDEX_MEMBER_ID = "memberId-index"
+
+# Global secondary index on confirmationNumber (appointments)
+INDEX_CONFIRMATION_NUMBER = "confirmationNumber-index"
+
+# Global secondary index on phoneLast4 (members)
+INDEX_PHONE_LAST4 = "phoneLast4-index"
+
 # Bedrock Model Configuration
 MODEL_MAX_TOKENS = 1024
 MODEL_TOP_P = 0.9
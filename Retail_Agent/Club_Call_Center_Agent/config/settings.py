@@ -10,6 +10,7 @@ from config.constants import (
     TABLE_MEMBERS,
     TABLE_STORE_INFO,
     TABLE_INVENTORY,
+    TABLE_INVENTORY_SEARCH,
     TABLE_CURBSIDE_ORDERS,
     TABLE_APPOINTMENTS,
     TABLE_SPECIALTY_ORDERS,
@@ -33,6 +34,7 @@ class CallCenterConfig:
     members_table: str = TABLE_MEMBERS
     store_info_table: str = TABLE_STORE_INFO
     inventory_table: str = TABLE_INVENTORY
+    inventory_search_table: str = TABLE_INVENTORY_SEARCH
     curbside_orders_table: str = TABLE_CURBSIDE_ORDERS
     appointments_table: str = TABLE_APPOINTMENTS
     specialty_orders_table: str = TABLE_SPECIALTY_ORDERS
@@ -56,6 +58,7 @@ class CallCenterConfig:
             members_table=os.getenv("CALLCENTER_MEMBERS_TABLE", TABLE_MEMBERS),
             store_info_table=os.getenv("CALLCENTER_STORE_INFO_TABLE", TABLE_STORE_INFO),
             inventory_table=os.getenv("CALLCENTER_INVENTORY_TABLE", TABLE_INVENTORY),
+            inventory_search_table=os.getenv("CALLCENTER_INVENTORY_SEARCH_TABLE", TABLE_INVENTORY_SEARCH),
             curbside_orders_table=os.getenv("CALLCENTER_CURBSIDE_ORDERS_TABLE", TABLE_CURBSIDE_ORDERS),
             appointments_table=os.getenv("CALLCENTER_APPOINTMENTS_TABLE", TABLE_APPOINTMENTS),
             specialty_orders_table=os.getenv("CALLCENTER_SPECIALTY_ORDERS_TABLE", TABLE_SPECIALTY_ORDERS),
@@ -0,0 +1,203 @@
+"""
+Batch Coordinator
+Coalesces concurrent GetItem lookups into DynamoDB BatchGetItem calls
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+
+from config.constants import (
+    BATCH_GET_WINDOW_SECONDS,
+    BATCH_GET_MAX_KEYS,
+    BATCH_GET_MAX_ATTEMPTS,
+    BATCH_GET_RESULT_TIMEOUT_SECONDS
+)
+from utils.logging import debug_print
+
+
+class BatchCoordinator:
+    """Collects GetItem requests from tool threads and submits them as one BatchGetItem"""
+
+    def __init__(self, dynamodb, window=BATCH_GET_WINDOW_SECONDS, max_keys=BATCH_GET_MAX_KEYS):
+        self.dynamodb = dynamodb
+        self.window = window
+        self.max_keys = max_keys
+        self.loop = None
+        self.queue = None
+        self.task = None
+        # Flushes handed to the executor, awaited by close()
+        self.flushes = set()
+        # get_item calls in progress; a lookup arriving while this is 0 has
+        # nothing to batch with and goes straight to GetItem
+        self._active = 0
+        self._active_lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.task is not None and not self.task.done()
+
+    def start(self):
+        """Start the drain task on the running event loop if it is not already up"""
+        if not self.running:
+            self.loop = asyncio.get_running_loop()
+            self.queue = asyncio.Queue()
+            self.task = self.loop.create_task(self._drain())
+
+    def get_item(self, table, key, projection=None, names=None):
+        """
+        Blocking GetItem for tools running on executor threads
+
+        Returns a get_item-shaped response ({'Item': ...} or {}). Falls back to a
+        direct GetItem when the coordinator is not running or when called from
+        the event loop thread itself, where waiting on the batch would deadlock.
+        """
+        with self._active_lock:
+            idle = self._active == 0
+            self._active += 1
+        try:
+            if idle or not self.running or self._on_loop_thread():
+                return self._direct_get(table, key, projection, names)
+
+            shape = (projection, tuple(sorted(names.items())) if names else ())
+            future = Future()
+            try:
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, (table, key, shape, future))
+                return future.result(timeout=BATCH_GET_RESULT_TIMEOUT_SECONDS)
+            except (FutureTimeoutError, RuntimeError) as e:
+                # Loop closed or batch stalled/stopped: don't leave the tool hanging
+                debug_print(f"Batched GetItem unavailable, fetching directly: {str(e)}")
+                future.cancel()
+                return self._direct_get(table, key, projection, names)
+        finally:
+            with self._active_lock:
+                self._active -= 1
+
+    async def close(self):
+        """Stop the drain task and wait for batches already being flushed"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self.flushes:
+            await asyncio.gather(*self.flushes, return_exceptions=True)
+
+    @staticmethod
+    def _direct_get(table, key, projection, names):
+        kwargs = {}
+        if projection:
+            kwargs["ProjectionExpression"] = projection
+            if names:
+                kwargs["ExpressionAttributeNames"] = names
+        return table.get_item(Key=key, **kwargs)
+
+    def _on_loop_thread(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    async def _drain(self):
+        """Gather requests for one batch window, then flush them off the loop"""
+        batch = []
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                deadline = self.loop.time() + self.window
+                while len(batch) < self.max_keys:
+                    timeout = deadline - self.loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                debug_print(f"Flushing batch of {len(batch)} GetItem request(s)")
+                flush = self.loop.run_in_executor(None, self._flush, batch)
+                self.flushes.add(flush)
+                flush.add_done_callback(self.flushes.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Fail everything not yet flushed so waiting tool threads wake up
+            stopped = RuntimeError("coordinator stopped")
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            for *_, future in batch:
+                self._resolve(future, exception=stopped)
+            raise
+
+    @staticmethod
+    def _resolve(future, result=None, exception=None):
+        """Settle a request future unless its caller already gave up on it"""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _flush(self, batch):
+        """Issue one BatchGetItem for the batch and resolve each waiting future"""
+        pending = {}
+        shapes = {}
+        for table, key, shape, future in batch:
+            pending.setdefault(table.name, (table, []))[1].append((key, future))
+            shapes.setdefault(table.name, set()).add(shape)
+
+        request_items = {}
+        for name, (_, requests) in pending.items():
+            keys = []
+            for key, _ in requests:
+                if key not in keys:
+                    keys.append(key)
+            request_items[name] = {"Keys": keys}
+
+            # One projection per table per call; mixed projections fetch whole items
+            if len(shapes[name]) == 1:
+                projection, names = next(iter(shapes[name]))
+                if projection:
+                    request_items[name]["ProjectionExpression"] = projection
+                    if names:
+                        request_items[name]["ExpressionAttributeNames"] = dict(names)
+
+        try:
+            found = self._batch_get(request_items, pending)
+        except Exception as e:
+            debug_print(f"BatchGetItem failed: {str(e)}")
+            for _, requests in pending.values():
+                for _, future in requests:
+                    self._resolve(future, exception=e)
+            return
+
+        for name, (_, requests) in pending.items():
+            items = found.get(name, [])
+            for key, future in requests:
+                match = next(
+                    (item for item in items if all(item.get(k) == v for k, v in key.items())),
+                    None
+                )
+                self._resolve(future, {"Item": match} if match is not None else {})
+
+    def _batch_get(self, request_items, pending):
+        """Run BatchGetItem, retrying unprocessed keys before falling back to GetItem"""
+        found = {}
+        for _ in range(BATCH_GET_MAX_ATTEMPTS):
+            response = self.dynamodb.batch_get_item(RequestItems=request_items)
+            for name, items in response.get("Responses", {}).items():
+                found.setdefault(name, []).extend(items)
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                return found
+
+        for name, spec in request_items.items():
+            table = pending[name][0]
+            kwargs = {k: v for k, v in spec.items() if k != "Keys"}
+            for key in spec["Keys"]:
+                item = table.get_item(Key=key, **kwargs).get("Item")
+                if item is not None:
+                    found.setdefault(name, []).append(item)
+        return found
@@ -2,19 +2,32 @@
 Call Center Tool Processor
 Coordinates tool execution for the call center agent
 """
-import asyncio
+import functools
 import json
-import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
+from botocore.config import Config
+from cachetools import TTLCache
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; stdlib json is a slower drop-in
+    _json = json
 
 from config.constants import (
     TABLE_MEMBERS,
     TABLE_STORE_INFO,
     TABLE_INVENTORY,
+    TABLE_INVENTORY_SEARCH,
     TABLE_CURBSIDE_ORDERS,
     TABLE_APPOINTMENTS,
     TABLE_SPECIALTY_ORDERS,
-    DEFAULT_AWS_REGION
+    DEFAULT_AWS_REGION,
+    DYNAMODB_MAX_POOL_CONNECTIONS,
+    DYNAMODB_MAX_ATTEMPTS,
+    TOOL_CACHE_MAXSIZE,
+    TOOL_CACHE_TTL_SECONDS,
+    TOOL_EXECUTOR_WORKERS
 )
 from tools import (
     VerifyMemberTool,
@@ -26,71 +39,65 @@ from tools import (
     ScheduleAppointmentTool,
     CheckAppointmentTool
 )
+from core.batch_coordinator import BatchCoordinator
 from utils.logging import debug_print
 
+# One resource per process so concurrent calls share a pool of kept-alive connections
+_DYNAMODB_CONFIG = Config(
+    max_pool_connections=DYNAMODB_MAX_POOL_CONNECTIONS,
+    retries={"max_attempts": DYNAMODB_MAX_ATTEMPTS, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_dynamo_resource():
+    """Return the process-wide DynamoDB resource, creating it on first use"""
+    return boto3.resource("dynamodb", region_name=DEFAULT_AWS_REGION, config=_DYNAMODB_CONFIG)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_table(name):
+    """Return the shared Table binding for a table name"""
+    return _get_dynamo_resource().Table(name)
+
+
+# Characters dropped from tool names before lookup
+_STRIP_TBL = str.maketrans('', '', ' \t_-')
+_MISSING = object()
+
 
 class CallCenterToolProcessor:
     """Handles all call center tools with DynamoDB integration"""
 
     def __init__(self):
-        self.tasks = {}
-        self.dynamodb = boto3.resource("dynamodb", region_name=DEFAULT_AWS_REGION)
+        self.dynamodb = _get_dynamo_resource()
 
         # Initialize DynamoDB tables
-        self.members_table = self.dynamodb.Table(TABLE_MEMBERS)
-        self.store_info_table = self.dynamodb.Table(TABLE_STORE_INFO)
-        self.inventory_table = self.dynamodb.Table(TABLE_INVENTORY)
-        self.curbside_table = self.dynamodb.Table(TABLE_CURBSIDE_ORDERS)
-        self.appointments_table = self.dynamodb.Table(TABLE_APPOINTMENTS)
-        self.specialty_table = self.dynamodb.Table(TABLE_SPECIALTY_ORDERS)
+        self.members_table = _get_table(TABLE_MEMBERS)
+        self.store_info_table = _get_table(TABLE_STORE_INFO)
+        self.inventory_table = _get_table(TABLE_INVENTORY)
+        self.inventory_search_table = _get_table(TABLE_INVENTORY_SEARCH)
+        self.curbside_table = _get_table(TABLE_CURBSIDE_ORDERS)
+        self.appointments_table = _get_table(TABLE_APPOINTMENTS)
+        self.specialty_table = _get_table(TABLE_SPECIALTY_ORDERS)
 
         # Initialize tool instances
         self.verify_member_tool = VerifyMemberTool(self.dynamodb, self.members_table)
         self.check_store_hours_tool = CheckStoreHoursTool(self.dynamodb, self.store_info_table)
-        self.check_inventory_tool = CheckInventoryTool(self.dynamodb, self.inventory_table)
+        self.check_inventory_tool = CheckInventoryTool(
+            self.dynamodb, self.inventory_table, self.inventory_search_table
+        )
         self.check_curbside_tool = CheckCurbsideOrderTool(self.dynamodb, self.curbside_table)
         self.check_specialty_tool = CheckSpecialtyOrderTool(self.dynamodb, self.specialty_table)
         self.create_cake_tool = CreateCakeOrderTool(self.dynamodb, self.specialty_table)
         self.schedule_appointment_tool = ScheduleAppointmentTool(self.dynamodb, self.appointments_table)
         self.check_appointment_tool = CheckAppointmentTool(self.dynamodb, self.appointments_table)
 
-        try:
-            self.loop = asyncio.get_running_loop()
-        except RuntimeError:
-            self.loop = asyncio.get_event_loop()
-
-    async def process_tool_async(self, tool_name, tool_content):
-        """Process a tool call asynchronously and return the result"""
-        task_id = str(uuid.uuid4())
-        task = asyncio.create_task(self._run_tool(tool_name, tool_content))
-        self.tasks[task_id] = task
-
-        try:
-            result = await task
-            return result
-        finally:
-            if task_id in self.tasks:
-                del self.tasks[task_id]
-
-    async def _run_tool(self, tool_name, tool_content):
-        """Internal method to execute the tool logic"""
-        debug_print(f"Processing tool: {tool_name}")
-        tool = tool_name.lower().replace(" ", "")
-        content = tool_content.get("content", {})
-
-        if isinstance(content, str):
-            try:
-                content_data = json.loads(content)
-            except json.JSONDecodeError:
-                content_data = {}
-        else:
-            content_data = content
-
-        # Route to appropriate tool handler
-        tool_handlers = {
+        # Route normalized tool names to handlers
+        self._tool_handlers = {
             "verifymembertool": self.verify_member_tool,
-            "checkstorehours tool": self.check_store_hours_tool,
-            "checkstorehoorstool": self.check_store_hours_tool,
+            "checkstorehourstool": self.check_store_hours_tool,
             "checkinventorytool": self.check_inventory_tool,
             "checkcurbsideordertool": self.check_curbside_tool,
             "scheduleappointmenttool": self.schedule_appointment_tool,
@@ -98,9 +105,76 @@ class CallCenterToolProcessor:
             "createcakeordertool": self.create_cake_tool,
             "checkappointmenttool": self.check_appointment_tool,
         }
+        self._aliases = {
+            "checkstorehoorstool": "checkstorehourstool",
+        }
+
+        # Point lookups from tools running concurrently share one BatchGetItem
+        self.batcher = BatchCoordinator(self.dynamodb)
+        for tool in (
+            self.verify_member_tool,
+            self.check_store_hours_tool,
+            self.check_inventory_tool,
+            self.check_curbside_tool,
+            self.check_specialty_tool,
+            self.check_appointment_tool,
+        ):
+            tool.batcher = self.batcher
+
+        # Tool bodies block on DynamoDB (and on batched lookups), so they get
+        # their own bounded pool; the default executor stays free for batch flushes
+        self._tool_executor = ThreadPoolExecutor(
+            max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="tool"
+        )
+        for tool in self._tool_handlers.values():
+            tool.executor = self._tool_executor
+
+        # Results of read-only lookups over near-static data (members, store info, inventory)
+        self._cache = TTLCache(maxsize=TOOL_CACHE_MAXSIZE, ttl=TOOL_CACHE_TTL_SECONDS)
+        self._cacheable_tools = {
+            self.verify_member_tool,
+            self.check_store_hours_tool,
+            self.check_inventory_tool,
+        }
+
+        # Bound entry points resolved once so dispatch is a single lookup
+        self._tool_execs = {name: tool.aexecute for name, tool in self._tool_handlers.items()}
+        self._cacheable_names = frozenset(
+            name for name, tool in self._tool_handlers.items() if tool in self._cacheable_tools
+        )
+
+    async def process_tool_async(self, tool_name, tool_content):
+        """Process a tool call asynchronously and return the result"""
+        return await self._run_tool(tool_name, tool_content)
 
-        handler = tool_handlers.get(tool)
-        if handler:
-            return await self.loop.run_in_executor(None, handler.execute, content_data)
-        else:
+    async def _run_tool(self, tool_name, tool_content):
+        """Internal method to execute the tool logic"""
+        debug_print(f"Processing tool: {tool_name}")
+        self.batcher.start()
+        key = tool_name.translate(_STRIP_TBL).lower()
+        name = self._aliases.get(key, key)
+        run = self._tool_execs.get(name, _MISSING)
+        if run is _MISSING:
             return {"error": f"Unsupported tool: {tool_name}"}
+
+        content = tool_content.get("content")
+        try:
+            content_data = _json.loads(content) if isinstance(content, (str, bytes)) else (content or {})
+        except json.JSONDecodeError:
+            content_data = {}
+
+        if name not in self._cacheable_names:
+            return await run(content_data)
+
+        cache_key = (name, json.dumps(content_data, sort_keys=True, default=str))
+        result = self._cache.get(cache_key)
+        if result is None:
+            result = await run(content_data)
+            if "error" not in result:
+                self._cache[cache_key] = result
+        return result
+
+    async def close(self):
+        """Stop GetItem batching and release the tool worker threads"""
+        await self.batcher.close()
+        self._tool_executor.shutdown(wait=False)
@@ -1,12 +1,16 @@
 import boto3
 import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
+from tools.store_tools import product_name_tokens
+
+
 def setup_call_center_demo_data():
     """
     Sets up DynamoDB tables for a club call center agent.
-    Creates tables for: Store_Info, Inventory, Curbside_Orders, Appointments, Specialty_Orders, Members
+    Creates tables for: Store_Info, Inventory, Inventory_Search, Curbside_Orders, Appointments, Specialty_Orders, Members
     """
     # Initialize DynamoDB resource
     dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
@@ -21,57 +25,137 @@ def setup_call_center_demo_data():
             'KeySchema': [{'AttributeName': 'sku', 'KeyType': 'HASH'}],
             'AttributeDefinitions': [{'AttributeName': 'sku', 'AttributeType': 'S'}]
         },
+        'CallCenter_Inventory_Search': {
+            'KeySchema': [
+                {'AttributeName': 'token', 'KeyType': 'HASH'},
+                {'AttributeName': 'sku', 'KeyType': 'RANGE'}
+            ],
+            'AttributeDefinitions': [
+                {'AttributeName': 'token', 'AttributeType': 'S'},
+                {'AttributeName': 'sku', 'AttributeType': 'S'}
+            ]
+        },
         'CallCenter_Curbside_Orders': {
             'KeySchema': [{'AttributeName': 'orderId', 'KeyType': 'HASH'}],
-            'AttributeDefinitions': [{'AttributeName': 'orderId', 'AttributeType': 'S'}]
+            'AttributeDefinitions': [
+                {'AttributeName': 'orderId', 'AttributeType': 'S'},
+                {'AttributeName': 'memberId', 'AttributeType': 'S'},
+                {'AttributeName': 'orderDate', 'AttributeType': 'S'}
+            ],
+            'GlobalSecondaryIndexes': [{
+                'IndexName': 'memberId-index',
+                'KeySchema': [
+                    {'AttributeName': 'memberId', 'KeyType': 'HASH'},
+                    {'AttributeName': 'orderDate', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+            }]
         },
         'CallCenter_Appointments': {
             'KeySchema': [{'AttributeName': 'appointmentId', 'KeyType': 'HASH'}],
-            'AttributeDefinitions': [{'AttributeName': 'appointmentId', 'AttributeType': 'S'}]
+            'AttributeDefinitions': [
+                {'AttributeName': 'appointmentId', 'AttributeType': 'S'},
+                {'AttributeName': 'memberId', 'AttributeType': 'S'},
+                {'AttributeName': 'appointmentDate', 'AttributeType': 'S'},
+                {'AttributeName': 'confirmationNumber', 'AttributeType': 'S'}
+            ],
+            'GlobalSecondaryIndexes': [{
+                'IndexName': 'memberId-index',
+                'KeySchema': [
+                    {'AttributeName': 'memberId', 'KeyType': 'HASH'},
+                    {'AttributeName': 'appointmentDate', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+            }, {
+                'IndexName': 'confirmationNumber-index',
+                'KeySchema': [{'AttributeName': 'confirmationNumber', 'KeyType': 'HASH'}],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+            }]
         },
         'CallCenter_Specialty_Orders': {
             'KeySchema': [{'AttributeName': 'orderId', 'KeyType': 'HASH'}],
-            'AttributeDefinitions': [{'AttributeName': 'orderId', 'AttributeType': 'S'}]
+            'AttributeDefinitions': [
+                {'AttributeName': 'orderId', 'AttributeType': 'S'},
+                {'AttributeName': 'memberId', 'AttributeType': 'S'},
+                {'AttributeName': 'pickupDate', 'AttributeType': 'S'}
+            ],
+            'GlobalSecondaryIndexes': [{
+                'IndexName': 'memberId-index',
+                'KeySchema': [
+                    {'AttributeName': 'memberId', 'KeyType': 'HASH'},
+                    {'AttributeName': 'pickupDate', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+            }]
         },
         'CallCenter_Members': {
             'KeySchema': [{'AttributeName': 'memberId', 'KeyType': 'HASH'}],
-            'AttributeDefinitions': [{'AttributeName': 'memberId', 'AttributeType': 'S'}]
+            'AttributeDefinitions': [
+                {'AttributeName': 'memberId', 'AttributeType': 'S'},
+                {'AttributeName': 'phoneLast4', 'AttributeType': 'S'}
+            ],
+            'GlobalSecondaryIndexes': [{
+                'IndexName': 'phoneLast4-index',
+                'KeySchema': [{'AttributeName': 'phoneLast4', 'KeyType': 'HASH'}],
+                'Projection': {
+                    'ProjectionType': 'INCLUDE',
+                    'NonKeyAttributes': ['name', 'phone', 'email', 'membershipType']
+                },
+                'ProvisionedThroughput': {'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+            }]
         }
     }
 
     # --- 2. Delete Old Tables & Create New Ones ---
+    # Issue every delete/create first, then wait on all tables in parallel
     print("--- Resetting Call Center Database ---")
-    for table_name, schema in tables.items():
-        table = dynamodb.Table(table_name)
-
-        # Delete if exists
+    deleted = []
+    for table_name in tables:
         try:
             print(f"Deleting old table: {table_name}...")
-            table.delete()
-            table.wait_until_not_exists()
-            print(f"Deleted {table_name}.")
+            dynamodb.Table(table_name).delete()
+            deleted.append(table_name)
         except Exception as e:
             if "ResourceNotFoundException" in str(e):
                 pass
             else:
                 print(f"Warning deleting {table_name}: {e}")
 
-        # Create new
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        list(executor.map(lambda name: dynamodb.Table(name).wait_until_not_exists(), deleted))
+    for table_name in deleted:
+        print(f"Deleted {table_name}.")
+
+    for table_name, schema in tables.items():
         print(f"Creating new table: {table_name}...")
         try:
+            extra = {}
+            if 'GlobalSecondaryIndexes' in schema:
+                extra['GlobalSecondaryIndexes'] = schema['GlobalSecondaryIndexes']
             dynamodb.create_table(
                 TableName=table_name,
                 KeySchema=schema['KeySchema'],
                 AttributeDefinitions=schema['AttributeDefinitions'],
-                ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+                ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5},
+                **extra
             )
-            table = dynamodb.Table(table_name)
-            table.wait_until_exists()
-            print(f"Ready: {table_name}")
         except Exception as e:
             print(f"Error creating {table_name}: {e}")
             return
 
+    try:
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            list(executor.map(lambda name: dynamodb.Table(name).wait_until_exists(), tables))
+    except Exception as e:
+        print(f"Error waiting for tables: {e}")
+        return
+    for table_name in tables:
+        print(f"Ready: {table_name}")
+
     # --- 3. Seed Store Info ---
     print("\n--- Seeding Store Information ---")
     store_info = dynamodb.Table('CallCenter_Store_Info')
@@ -187,8 +271,16 @@ def setup_call_center_demo_data():
         }
     ]
 
-    for item in items:
-        inventory.put_item(Item=item)
+    with inventory.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+
+    # One (token, sku) row per word of each product name for name search
+    inventory_search = dynamodb.Table('CallCenter_Inventory_Search')
+    with inventory_search.batch_writer() as batch:
+        for item in items:
+            for token in product_name_tokens(item['productName']):
+                batch.put_item(Item={'token': token, 'sku': item['sku']})
 
     print(f"Inventory seeded: {len(items)} products")
 
@@ -198,57 +290,58 @@ def setup_call_center_demo_data():
 
     tomorrow = (today + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
 
-    # Order 1: Ready for pickup
-    curbside.put_item(Item={
-        'orderId': 'CURB-20260127-001',
-        'memberId': 'MEM-100001',
-        'memberName': 'Sarah Chen',
-        'orderDate': today.strftime('%Y-%m-%d'),
-        'orderTime': '09:15:00',
-        'status': 'Ready for Pickup',
-        'pickupInstructions': 'Park in designated curbside spots 1-10. Call when you arrive.',
-        'items': [
-            {'sku': 'FOOD-12345', 'name': 'Organic Almond Milk 12-Pack', 'quantity': 2},
-            {'sku': 'FOOD-99999', 'name': 'Rotisserie Chicken', 'quantity': 1}
-        ],
-        'total': Decimal('36.97'),
-        'estimatedPickupTime': '12:00 PM - 2:00 PM',
-        'readyTime': '11:45 AM'
-    })
-
-    # Order 2: Being prepared
-    curbside.put_item(Item={
-        'orderId': 'CURB-20260127-002',
-        'memberId': 'MEM-200045',
-        'memberName': 'Michael Torres',
-        'orderDate': today.strftime('%Y-%m-%d'),
-        'orderTime': '13:30:00',
-        'status': 'Being Prepared',
-        'pickupInstructions': 'Park in designated curbside spots 1-10. Call when you arrive.',
-        'items': [
-            {'sku': 'ELEC-98765', 'name': 'Samsung 65" 4K Smart TV', 'quantity': 1}
-        ],
-        'total': Decimal('799.99'),
-        'estimatedPickupTime': '4:00 PM - 6:00 PM',
-        'readyTime': None
-    })
-
-    # Order 3: Scheduled for tomorrow
-    curbside.put_item(Item={
-        'orderId': 'CURB-20260128-001',
-        'memberId': 'MEM-300123',
-        'memberName': 'Jennifer Walsh',
-        'orderDate': tomorrow,
-        'orderTime': '08:00:00',
-        'status': 'Scheduled',
-        'pickupInstructions': 'Park in designated curbside spots 1-10. Call when you arrive.',
-        'items': [
-            {'sku': 'TIRE-11111', 'name': 'Michelin Tire 225/65R17', 'quantity': 4}
-        ],
-        'total': Decimal('759.96'),
-        'estimatedPickupTime': '10:00 AM - 12:00 PM',
-        'readyTime': None
-    })
+    with curbside.batch_writer() as batch:
+        # Order 1: Ready for pickup
+        batch.put_item(Item={
+            'orderId': 'CURB-20260127-001',
+            'memberId': 'MEM-100001',
+            'memberName': 'Sarah Chen',
+            'orderDate': today.strftime('%Y-%m-%d'),
+            'orderTime': '09:15:00',
+            'status': 'Ready for Pickup',
+            'pickupInstructions': 'Park in designated curbside spots 1-10. Call when you arrive.',
+            'items': [
+                {'sku': 'FOOD-12345', 'name': 'Organic Almond Milk 12-Pack', 'quantity': 2},
+                {'sku': 'FOOD-99999', 'name': 'Rotisserie Chicken', 'quantity': 1}
+            ],
+            'total': Decimal('36.97'),
+            'estimatedPickupTime': '12:00 PM - 2:00 PM',
+            'readyTime': '11:45 AM'
+        })
+
+        # Order 2: Being prepared
+        batch.put_item(Item={
+            'orderId': 'CURB-20260127-002',
+            'memberId': 'MEM-200045',
+            'memberName': 'Michael Torres',
+            'orderDate': today.strftime('%Y-%m-%d'),
+            'orderTime': '13:30:00',
+            'status': 'Being Prepared',
+            'pickupInstructions': 'Park in designated curbside spots 1-10. Call when you arrive.',
+            'items': [
+                {'sku': 'ELEC-98765', 'name': 'Samsung 65" 4K Smart TV', 'quantity': 1}
+            ],
+            'total': Decimal('799.99'),
+            'estimatedPickupTime': '4:00 PM - 6:00 PM',
+            'readyTime': None
+        })
+
+        # Order 3: Scheduled for tomorrow
+        batch.put_item(Item={
+            'orderId': 'CURB-20260128-001',
+            'memberId': 'MEM-300123',
+            'memberName': 'Jennifer Walsh',
+            'orderDate': tomorrow,
+            'orderTime': '08:00:00',
+            'status': 'Scheduled',
+            'pickupInstructions': 'Park in designated curbside spots 1-10. Call when you arrive.',
+            'items': [
+                {'sku': 'TIRE-11111', 'name': 'Michelin Tire 225/65R17', 'quantity': 4}
+            ],
+            'total': Decimal('759.96'),
+            'estimatedPickupTime': '10:00 AM - 12:00 PM',
+            'readyTime': None
+        })
 
     print("Curbside orders seeded: 3 orders")
 
@@ -256,51 +349,53 @@ def setup_call_center_demo_data():
     print("\n--- Seeding Appointments ---")
     appointments = dynamodb.Table('CallCenter_Appointments')
 
-    # Appointment 1: Tire installation today
-    appointments.put_item(Item={
-        'appointmentId': 'APPT-TIRE-20260127-001',
-        'memberId': 'MEM-100001',
-        'memberName': 'Sarah Chen',
-        'department': 'TireCenter',
-        'serviceType': 'Tire Installation',
-        'appointmentDate': today.strftime('%Y-%m-%d'),
-        'appointmentTime': '3:00 PM',
-        'duration': '1 hour',
-        'status': 'Confirmed',
-        'notes': '4 new tires - Michelin Defender',
-        'confirmationNumber': 'TIRE-54321'
-    })
-
-    # Appointment 2: Eye exam next week
     next_week = (today + datetime.timedelta(days=7)).strftime('%Y-%m-%d')
-    appointments.put_item(Item={
-        'appointmentId': 'APPT-OPT-20260203-001',
-        'memberId': 'MEM-200045',
-        'memberName': 'Michael Torres',
-        'department': 'OpticalCenter',
-        'serviceType': 'Eye Exam',
-        'appointmentDate': next_week,
-        'appointmentTime': '10:00 AM',
-        'duration': '45 minutes',
-        'status': 'Confirmed',
-        'notes': 'Annual checkup',
-        'confirmationNumber': 'OPT-12345'
-    })
 
-    # Appointment 3: Prescription pickup ready
-    appointments.put_item(Item={
-        'appointmentId': 'APPT-PHRM-20260127-001',
-        'memberId': 'MEM-300123',
-        'memberName': 'Jennifer Walsh',
-        'department': 'Pharmacy',
-        'serviceType': 'Prescription Pickup',
-        'appointmentDate': today.strftime('%Y-%m-%d'),
-        'appointmentTime': 'Any time',
-        'duration': 'N/A',
-        'status': 'Ready',
-        'notes': 'Prescription #RX-98765 filled and ready',
-        'confirmationNumber': 'PHRM-67890'
-    })
+    with appointments.batch_writer() as batch:
+        # Appointment 1: Tire installation today
+        batch.put_item(Item={
+            'appointmentId': 'APPT-TIRE-20260127-001',
+            'memberId': 'MEM-100001',
+            'memberName': 'Sarah Chen',
+            'department': 'TireCenter',
+            'serviceType': 'Tire Installation',
+            'appointmentDate': today.strftime('%Y-%m-%d'),
+            'appointmentTime': '3:00 PM',
+            'duration': '1 hour',
+            'status': 'Confirmed',
+            'notes': '4 new tires - Michelin Defender',
+            'confirmationNumber': 'TIRE-54321'
+        })
+
+        # Appointment 2: Eye exam next week
+        batch.put_item(Item={
+            'appointmentId': 'APPT-OPT-20260203-001',
+            'memberId': 'MEM-200045',
+            'memberName': 'Michael Torres',
+            'department': 'OpticalCenter',
+            'serviceType': 'Eye Exam',
+            'appointmentDate': next_week,
+            'appointmentTime': '10:00 AM',
+            'duration': '45 minutes',
+            'status': 'Confirmed',
+            'notes': 'Annual checkup',
+            'confirmationNumber': 'OPT-12345'
+        })
+
+        # Appointment 3: Prescription pickup ready
+        batch.put_item(Item={
+            'appointmentId': 'APPT-PHRM-20260127-001',
+            'memberId': 'MEM-300123',
+            'memberName': 'Jennifer Walsh',
+            'department': 'Pharmacy',
+            'serviceType': 'Prescription Pickup',
+            'appointmentDate': today.strftime('%Y-%m-%d'),
+            'appointmentTime': 'Any time',
+            'duration': 'N/A',
+            'status': 'Ready',
+            'notes': 'Prescription #RX-98765 filled and ready',
+            'confirmationNumber': 'PHRM-67890'
+        })
 
     print("Appointments seeded: 3 appointments")
 
@@ -310,45 +405,46 @@ def setup_call_center_demo_data():
 
     pickup_tomorrow = (today + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
 
-    # Cake order 1: Ready for pickup tomorrow
-    specialty.put_item(Item={
-        'orderId': 'CAKE-20260125-001',
-        'memberId': 'MEM-100001',
-        'memberName': 'Sarah Chen',
-        'orderType': 'Cake',
-        'orderDate': (today - datetime.timedelta(days=2)).strftime('%Y-%m-%d'),
-        'pickupDate': pickup_tomorrow,
-        'pickupTime': '2:00 PM',
-        'status': 'Ready',
-        'details': {
-            'size': 'Half Sheet',
-            'flavor': 'Chocolate with Vanilla Frosting',
-            'inscription': 'Happy Birthday Emma!',
-            'decorations': 'Pink and purple flowers, unicorn theme'
-        },
-        'price': Decimal('34.99'),
-        'confirmationNumber': 'CAKE-78901'
-    })
-
-    # Cake order 2: In progress
-    specialty.put_item(Item={
-        'orderId': 'CAKE-20260126-001',
-        'memberId': 'MEM-200045',
-        'memberName': 'Michael Torres',
-        'orderType': 'Cake',
-        'orderDate': (today - datetime.timedelta(days=1)).strftime('%Y-%m-%d'),
-        'pickupDate': (today + datetime.timedelta(days=2)).strftime('%Y-%m-%d'),
-        'pickupTime': '5:00 PM',
-        'status': 'In Progress',
-        'details': {
-            'size': 'Quarter Sheet',
-            'flavor': 'Vanilla with Buttercream',
-            'inscription': 'Congratulations Team!',
-            'decorations': 'Company colors - blue and white'
-        },
-        'price': Decimal('24.99'),
-        'confirmationNumber': 'CAKE-78902'
-    })
+    with specialty.batch_writer() as batch:
+        # Cake order 1: Ready for pickup tomorrow
+        batch.put_item(Item={
+            'orderId': 'CAKE-20260125-001',
+            'memberId': 'MEM-100001',
+            'memberName': 'Sarah Chen',
+            'orderType': 'Cake',
+            'orderDate': (today - datetime.timedelta(days=2)).strftime('%Y-%m-%d'),
+            'pickupDate': pickup_tomorrow,
+            'pickupTime': '2:00 PM',
+            'status': 'Ready',
+            'details': {
+                'size': 'Half Sheet',
+                'flavor': 'Chocolate with Vanilla Frosting',
+                'inscription': 'Happy Birthday Emma!',
+                'decorations': 'Pink and purple flowers, unicorn theme'
+            },
+            'price': Decimal('34.99'),
+            'confirmationNumber': 'CAKE-78901'
+        })
+
+        # Cake order 2: In progress
+        batch.put_item(Item={
+            'orderId': 'CAKE-20260126-001',
+            'memberId': 'MEM-200045',
+            'memberName': 'Michael Torres',
+            'orderType': 'Cake',
+            'orderDate': (today - datetime.timedelta(days=1)).strftime('%Y-%m-%d'),
+            'pickupDate': (today + datetime.timedelta(days=2)).strftime('%Y-%m-%d'),
+            'pickupTime': '5:00 PM',
+            'status': 'In Progress',
+            'details': {
+                'size': 'Quarter Sheet',
+                'flavor': 'Vanilla with Buttercream',
+                'inscription': 'Congratulations Team!',
+                'decorations': 'Company colors - blue and white'
+            },
+            'price': Decimal('24.99'),
+            'confirmationNumber': 'CAKE-78902'
+        })
 
     print("Specialty orders seeded: 2 cake orders")
 
@@ -356,29 +452,33 @@ def setup_call_center_demo_data():
     print("\n--- Seeding Members ---")
     members = dynamodb.Table('CallCenter_Members')
 
-    members.put_item(Item={
-        'memberId': 'MEM-100001',
-        'name': 'Sarah Chen',
-        'phone': '+1-555-234-5678',
-        'email': 'sarah.chen@example.com',
-        'membershipType': 'Pro'
-    })
-
-    members.put_item(Item={
-        'memberId': 'MEM-200045',
-        'name': 'Michael Torres',
-        'phone': '+1-555-876-5432',
-        'email': 'mtorres@smallbiz.com',
-        'membershipType': 'Business'
-    })
-
-    members.put_item(Item={
-        'memberId': 'MEM-300123',
-        'name': 'Jennifer Walsh',
-        'phone': '+1-555-321-9876',
-        'email': 'jwalsh@email.com',
-        'membershipType': 'Consumer'
-    })
+    with members.batch_writer() as batch:
+        batch.put_item(Item={
+            'memberId': 'MEM-100001',
+            'name': 'Sarah Chen',
+            'phone': '+1-555-234-5678',
+            'phoneLast4': '5678',
+            'email': 'sarah.chen@example.com',
+            'membershipType': 'Pro'
+        })
+
+        batch.put_item(Item={
+            'memberId': 'MEM-200045',
+            'name': 'Michael Torres',
+            'phone': '+1-555-876-5432',
+            'phoneLast4': '5432',
+            'email': 'mtorres@smallbiz.com',
+            'membershipType': 'Business'
+        })
+
+        batch.put_item(Item={
+            'memberId': 'MEM-300123',
+            'name': 'Jennifer Walsh',
+            'phone': '+1-555-321-9876',
+            'phoneLast4': '9876',
+            'email': 'jwalsh@email.com',
+            'membershipType': 'Consumer'
+        })
 
     print("Members seeded: 3 members")
 
@@ -3,6 +3,7 @@ Audio Streamer for Call Center Agent
 Handles continuous microphone input and audio output using separate streams
 """
 import asyncio
+import threading
 import pyaudio
 
 from config.constants import (
@@ -10,7 +11,8 @@ from config.constants import (
     OUTPUT_SAMPLE_RATE,
     CHANNELS,
     AUDIO_FORMAT,
-    CHUNK_SIZE
+    CHUNK_SIZE,
+    BYTES_PER_FRAME
 )
 from utils.logging import debug_print
 from utils.timing import time_it
@@ -22,7 +24,14 @@ class AudioStreamer:
     def __init__(self, stream_manager):
         self.stream_manager = stream_manager
         self.is_streaming = False
-        self.loop = asyncio.get_event_loop()
+        self.loop = asyncio.get_running_loop()
+
+        # PCM waiting to be pulled by the output callback
+        self._out_buf = bytearray()
+        self._out_lock = threading.Lock()
+
+        # Response audio is written straight into the output buffer
+        stream_manager.audio_player = self
 
         debug_print("AudioStreamer Initializing PyAudio...")
         self.p = time_it("AudioStreamerInitPyAudio", pyaudio.PyAudio)
@@ -51,6 +60,7 @@ class AudioStreamer:
                 rate=OUTPUT_SAMPLE_RATE,
                 output=True,
                 frames_per_buffer=CHUNK_SIZE,
+                stream_callback=self.output_callback,
             ),
         )
 
@@ -64,6 +74,17 @@ class AudioStreamer:
             )
         return (None, pyaudio.paContinue)
 
+    def output_callback(self, in_data, frame_count, time_info, status):
+        """Callback function that feeds buffered response audio to the speaker"""
+        size = frame_count * BYTES_PER_FRAME
+        with self._out_lock:
+            data = bytes(self._out_buf[:size])
+            del self._out_buf[:size]
+        if len(data) < size:
+            # Pad with silence; a short buffer would end the stream
+            data += b"\x00" * (size - len(data))
+        return (data, pyaudio.paContinue)
+
     async def process_input_audio(self, audio_data):
         """Process a single audio chunk directly"""
         try:
@@ -72,51 +93,16 @@ class AudioStreamer:
             if self.is_streaming:
                 print(f"Error processing input audio: {e}")
 
-    async def play_output_audio(self):
-        """Play audio responses from Nova Sonic"""
-        while self.is_streaming:
-            try:
-                if self.stream_manager.barge_in:
-                    while not self.stream_manager.audio_output_queue.empty():
-                        try:
-                            self.stream_manager.audio_output_queue.get_nowait()
-                        except asyncio.QueueEmpty:
-                            break
-                    self.stream_manager.barge_in = False
-                    await asyncio.sleep(0.05)
-                    continue
-
-                audio_data = await asyncio.wait_for(
-                    self.stream_manager.audio_output_queue.get(), timeout=0.1
-                )
-
-                if audio_data and self.is_streaming:
-                    chunk_size = CHUNK_SIZE
-
-                    for i in range(0, len(audio_data), chunk_size):
-                        if not self.is_streaming:
-                            break
-
-                        end = min(i + chunk_size, len(audio_data))
-                        chunk = audio_data[i:end]
-
-                        def write_chunk(data):
-                            return self.output_stream.write(data)
-
-                        await asyncio.get_event_loop().run_in_executor(
-                            None, write_chunk, chunk
-                        )
-
-                        await asyncio.sleep(0.001)
-
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                if self.is_streaming:
-                    print(f"Error playing output audio: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                await asyncio.sleep(0.05)
+    def write(self, audio_bytes):
+        """Append response audio for the output callback; safe from any thread"""
+        if audio_bytes and self.is_streaming:
+            with self._out_lock:
+                self._out_buf.extend(audio_bytes)
+
+    def clear(self):
+        """Drop all response audio not yet played (used on barge-in)"""
+        with self._out_lock:
+            self._out_buf.clear()
 
     async def start_streaming(self):
         """Start streaming audio."""
@@ -132,17 +118,28 @@ class AudioStreamer:
             lambda: self.stream_manager.send_audio_content_start_event(),
         )
 
+        # Both streams run in callback mode and started when opened; flipping
+        # the flag only after contentStart keeps audio from preceding it
         self.is_streaming = True
 
-        if not self.input_stream.is_active():
-            self.input_stream.start_stream()
-
-        self.output_task = asyncio.create_task(self.play_output_audio())
-
-        await asyncio.get_event_loop().run_in_executor(None, input)
+        # Wait for Enter on a dedicated thread so the default executor stays
+        # free for tool calls
+        stop_event = asyncio.Event()
+        threading.Thread(
+            target=self._wait_for_enter, args=(stop_event,), daemon=True
+        ).start()
+        await stop_event.wait()
 
         await self.stop_streaming()
 
+    def _wait_for_enter(self, stop_event):
+        """Block on stdin and signal the event loop once Enter is pressed"""
+        try:
+            input()
+        except EOFError:
+            pass
+        self.loop.call_soon_threadsafe(stop_event.set)
+
     async def stop_streaming(self):
         """Stop streaming audio."""
         if not self.is_streaming:
@@ -153,8 +150,6 @@ class AudioStreamer:
         tasks = []
         if hasattr(self, "input_task") and not self.input_task.done():
             tasks.append(self.input_task)
-        if hasattr(self, "output_task") and not self.output_task.done():
-            tasks.append(self.output_task)
         for task in tasks:
             task.cancel()
         if tasks:
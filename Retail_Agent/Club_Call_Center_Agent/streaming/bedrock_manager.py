@@ -6,6 +6,8 @@ import asyncio
 import json
 import uuid
 import base64
+import itertools
+import re
 
 from aws_sdk_bedrock_runtime.client import (
     BedrockRuntimeClient,
@@ -14,160 +16,148 @@ from aws_sdk_bedrock_runtime.client import (
 from aws_sdk_bedrock_runtime.models import (
     InvokeModelWithBidirectionalStreamInputChunk,
     BidirectionalInputPayloadPart,
+    ValidationException,
 )
 from aws_sdk_bedrock_runtime.config import Config
 from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
 
-from config.constants import MODEL_MAX_TOKENS, MODEL_TOP_P, MODEL_TEMPERATURE
+from config.constants import (
+    MODEL_MAX_TOKENS,
+    MODEL_TOP_P,
+    MODEL_TEMPERATURE,
+    AUDIO_INPUT_MAX_BATCH,
+    AUDIO_INPUT_QUEUE_MAXSIZE,
+    OUTPUT_QUEUE_MAXSIZE
+)
 from utils.logging import debug_print
 from utils.timing import time_it_async
 from streaming.tool_schemas import get_tool_schemas
 from prompts import get_call_center_system_prompt
 
+try:
+    import orjson
 
-class BedrockStreamManager:
-    """Manages bidirectional streaming with AWS Bedrock using asyncio"""
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json is a slower drop-in
 
-    # Event templates
-    START_SESSION_EVENT = """{
-        "event": {
-            "sessionStart": {
-            "inferenceConfiguration": {
-                "maxTokens": 1024,
-                "topP": 0.9,
-                "temperature": 0.7
-                }
-            }
-        }
-    }"""
+    def _dumps(obj):
+        # Match orjson's output: compact, UTF-8, no circular-reference walk
+        return json.dumps(
+            obj, check_circular=False, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
 
-    CONTENT_START_EVENT = """{
-        "event": {
-            "contentStart": {
-            "promptName": "%s",
-            "contentName": "%s",
-            "type": "AUDIO",
-            "interactive": true,
-            "role": "USER",
-            "audioInputConfiguration": {
-                "mediaType": "audio/lpcm",
-                "sampleRateHertz": 16000,
-                "sampleSizeBits": 16,
-                "channelCount": 1,
-                "audioType": "SPEECH",
-                "encoding": "base64"
-                }
-            }
-        }
-    }"""
+    _loads = json.loads
 
-    AUDIO_EVENT_TEMPLATE = """{
-        "event": {
-            "audioInput": {
-            "promptName": "%s",
-            "contentName": "%s",
-            "content": "%s"
-            }
-        }
-    }"""
+_PROMPT_NAME_PLACEHOLDER = "__PROMPT_NAME__"
 
-    TEXT_CONTENT_START_EVENT = """{
-        "event": {
-            "contentStart": {
-            "promptName": "%s",
-            "contentName": "%s",
-            "type": "TEXT",
-            "role": "%s",
-            "interactive": false,
-                "textInputConfiguration": {
-                    "mediaType": "text/plain"
-                }
-            }
-        }
-    }"""
 
-    TEXT_INPUT_EVENT = """{
-        "event": {
-            "textInput": {
-            "promptName": "%s",
-            "contentName": "%s",
-            "content": "%s"
-            }
-        }
-    }"""
+def _put_drop_oldest(queue, item):
+    """Put without blocking, discarding the oldest entry if the queue is full"""
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        queue.get_nowait()
+        queue.put_nowait(item)
 
-    TOOL_CONTENT_START_EVENT = """{
-        "event": {
-            "contentStart": {
-                "promptName": "%s",
-                "contentName": "%s",
-                "interactive": false,
-                "type": "TOOL",
-                "role": "TOOL",
-                "toolResultInputConfiguration": {
-                    "toolUseId": "%s",
-                    "type": "TEXT",
-                    "textInputConfiguration": {
-                        "mediaType": "text/plain"
-                    }
-                }
-            }
-        }
-    }"""
 
-    CONTENT_END_EVENT = """{
-        "event": {
-            "contentEnd": {
-            "promptName": "%s",
-            "contentName": "%s"
-            }
-        }
-    }"""
+def _encode_all(values):
+    """Encode template arguments for bytes %-formatting"""
+    return tuple(value.encode("utf-8") for value in values)
 
-    PROMPT_END_EVENT = """{
-        "event": {
-            "promptEnd": {
-            "promptName": "%s"
-            }
-        }
-    }"""
 
-    SESSION_END_EVENT = """{
-        "event": {
-            "sessionEnd": {}
-        }
-    }"""
+_EVENT_TYPE_RE = re.compile(rb'\{\s*"event"\s*:\s*\{\s*"(\w+)"')
+_AUDIO_OUTPUT_MARKER = b'"audioOutput"'
+_BARGE_IN_MARKER = b'{ \\"interrupted\\" : true }'
+_AUDIO_CONTENT_RE = re.compile(rb'"content"\s*:\s*"([^"]+)"')
+_SPECULATIVE_RE = re.compile(r'"generationStage"\s*:\s*"SPECULATIVE"')
 
-    def start_prompt(self):
-        """Create a promptStart event with call center tools"""
-        tool_schemas = get_tool_schemas()
 
-        prompt_start_event = {
-            "event": {
-                "promptStart": {
-                    "promptName": self.prompt_name,
-                    "textOutputConfiguration": {"mediaType": "text/plain"},
-                    "audioOutputConfiguration": {
-                        "mediaType": "audio/lpcm",
-                        "sampleRateHertz": 24000,
-                        "sampleSizeBits": 16,
-                        "channelCount": 1,
-                        "voiceId": "matthew",
-                        "encoding": "base64",
-                        "audioType": "SPEECH",
-                    },
-                    "toolUseOutputConfiguration": {"mediaType": "application/json"},
-                    "toolConfiguration": {"tools": tool_schemas}
+class BedrockStreamManager:
+    """Manages bidirectional streaming with AWS Bedrock using asyncio"""
+
+    # Event templates
+    START_SESSION_EVENT = _dumps({
+        "event": {
+            "sessionStart": {
+                "inferenceConfiguration": {
+                    "maxTokens": MODEL_MAX_TOKENS,
+                    "topP": MODEL_TOP_P,
+                    "temperature": MODEL_TEMPERATURE,
                 }
             }
         }
+    })
+
+    CONTENT_START_EVENT = (
+        b'{"event":{"contentStart":{"promptName":"%s","contentName":"%s",'
+        b'"type":"AUDIO","interactive":true,"role":"USER",'
+        b'"audioInputConfiguration":{"mediaType":"audio/lpcm","sampleRateHertz":16000,'
+        b'"sampleSizeBits":16,"channelCount":1,"audioType":"SPEECH","encoding":"base64"}}}}'
+    )
+
+    AUDIO_EVENT_TEMPLATE = b'{"event":{"audioInput":{"promptName":"%s","contentName":"%s","content":"%s"}}}'
+
+    TEXT_CONTENT_START_EVENT = (
+        b'{"event":{"contentStart":{"promptName":"%s","contentName":"%s",'
+        b'"type":"TEXT","role":"%s","interactive":false,'
+        b'"textInputConfiguration":{"mediaType":"text/plain"}}}}'
+    )
+
+    TEXT_INPUT_EVENT = b'{"event":{"textInput":{"promptName":"%s","contentName":"%s","content":"%s"}}}'
+
+    TOOL_CONTENT_START_EVENT = (
+        b'{"event":{"contentStart":{"promptName":"%s","contentName":"%s",'
+        b'"interactive":false,"type":"TOOL","role":"TOOL",'
+        b'"toolResultInputConfiguration":{"toolUseId":"%s","type":"TEXT",'
+        b'"textInputConfiguration":{"mediaType":"text/plain"}}}}}'
+    )
+
+    CONTENT_END_EVENT = b'{"event":{"contentEnd":{"promptName":"%s","contentName":"%s"}}}'
+
+    PROMPT_END_EVENT = b'{"event":{"promptEnd":{"promptName":"%s"}}}'
+
+    SESSION_END_EVENT = b'{"event":{"sessionEnd":{}}}'
+
+    # promptStart JSON split around promptName, built on first use
+    _PROMPT_START_PARTS = None
+
+    @classmethod
+    def _prompt_start_parts(cls):
+        """Serialize the promptStart event once, split around the prompt name"""
+        if cls._PROMPT_START_PARTS is None:
+            prompt_start_event = {
+                "event": {
+                    "promptStart": {
+                        "promptName": _PROMPT_NAME_PLACEHOLDER,
+                        "textOutputConfiguration": {"mediaType": "text/plain"},
+                        "audioOutputConfiguration": {
+                            "mediaType": "audio/lpcm",
+                            "sampleRateHertz": 24000,
+                            "sampleSizeBits": 16,
+                            "channelCount": 1,
+                            "voiceId": "matthew",
+                            "encoding": "base64",
+                            "audioType": "SPEECH",
+                        },
+                        "toolUseOutputConfiguration": {"mediaType": "application/json"},
+                        "toolConfiguration": {"tools": get_tool_schemas()}
+                    }
+                }
+            }
+            prefix, suffix = _dumps(prompt_start_event).split(_dumps(_PROMPT_NAME_PLACEHOLDER))
+            cls._PROMPT_START_PARTS = (prefix, suffix)
+        return cls._PROMPT_START_PARTS
 
-        return json.dumps(prompt_start_event)
+    def start_prompt(self):
+        """Create a promptStart event with call center tools, as bytes"""
+        prefix, suffix = self._prompt_start_parts()
+        return prefix + _dumps(self.prompt_name) + suffix
 
     def tool_result_event(self, content_name, content, role):
-        """Create a tool result event"""
+        """Create a tool result event, as bytes"""
         if isinstance(content, dict):
-            content_json_string = json.dumps(content)
+            content_json_string = _dumps(content).decode("utf-8")
         else:
             content_json_string = content
 
@@ -180,23 +170,24 @@ class BedrockStreamManager:
                 }
             }
         }
-        return json.dumps(tool_result_event)
+        return _dumps(tool_result_event)
 
     def __init__(self, tool_processor, model_id="amazon.nova-sonic-v1:0", region="us-east-1"):
         """Initialize the stream manager."""
         self.model_id = model_id
         self.region = region
 
-        self.audio_input_queue = asyncio.Queue()
-        self.audio_output_queue = asyncio.Queue()
-        self.output_queue = asyncio.Queue()
+        # Bounded so a stalled consumer cannot grow memory without limit;
+        # both queues drop their oldest entry when full
+        self.audio_input_queue = asyncio.Queue(maxsize=AUDIO_INPUT_QUEUE_MAXSIZE)
+        self.output_queue = asyncio.Queue(maxsize=OUTPUT_QUEUE_MAXSIZE)
 
         self.response_task = None
         self.stream_response = None
         self.is_active = False
-        self.barge_in = False
         self.bedrock_client = None
 
+        # Receives decoded response audio directly via write()/clear()
         self.audio_player = None
         self.display_assistant_text = False
         self.role = None
@@ -204,6 +195,18 @@ class BedrockStreamManager:
         self.prompt_name = str(uuid.uuid4())
         self.content_name = str(uuid.uuid4())
         self.audio_content_name = str(uuid.uuid4())
+
+        # Tool result content names only need to be unique within this session
+        self._tool_content_prefix = f"tool-{self.prompt_name}-"
+        self._tool_content_ids = itertools.count(1)
+
+        # Hot-path event templates with this session's names baked in, as bytes
+        self._audio_prefix, self._audio_suffix = self._bake_template(
+            self.AUDIO_EVENT_TEMPLATE, self.prompt_name, self.audio_content_name
+        )
+        self._content_end_tmpl = self._bake_template(self.CONTENT_END_EVENT, self.prompt_name)
+        self._tool_start_tmpl = self._bake_template(self.TOOL_CONTENT_START_EVENT, self.prompt_name)
+
         self.toolUseContent = ""
         self.toolUseId = ""
         self.toolName = ""
@@ -212,6 +215,35 @@ class BedrockStreamManager:
         self.tool_processor = tool_processor
         self.pending_tool_tasks = {}
 
+        # Response event type -> handler, keyed by the event's single top-level field
+        self._event_handlers = {
+            "audioOutput": self._on_audio_output,
+            "textOutput": self._on_text_output,
+            "contentStart": self._on_content_start,
+            "contentEnd": self._on_content_end,
+            "toolUse": self._on_tool_use,
+            "completionStart": self._on_completion_start,
+            "completionEnd": self._on_completion_end,
+            "usageEvent": self._on_usage_event,
+        }
+
+    @staticmethod
+    def _bake_template(template, *fixed):
+        """Fill the leading %s slots of a template and split it into byte parts
+        around the remaining ones"""
+        open_slots = template.count(b"%s") - len(fixed)
+        filled = template % (_encode_all(fixed) + (b"\0",) * open_slots)
+        return tuple(filled.split(b"\0"))
+
+    @staticmethod
+    def _render(parts, *values):
+        """Join baked template parts with the encoded values for the open slots"""
+        out = [parts[0]]
+        for value, part in zip(values, parts[1:]):
+            out.append(value.encode("utf-8"))
+            out.append(part)
+        return b"".join(out)
+
     def _initialize_client(self):
         """Initialize the Bedrock client."""
         config = Config(
@@ -242,20 +274,20 @@ class BedrockStreamManager:
 
             # Send initialization events
             prompt_event = self.start_prompt()
-            text_content_start = self.TEXT_CONTENT_START_EVENT % (
+            text_content_start = self.TEXT_CONTENT_START_EVENT % _encode_all((
                 self.prompt_name,
                 self.content_name,
                 "SYSTEM",
-            )
-            text_content = self.TEXT_INPUT_EVENT % (
+            ))
+            text_content = self.TEXT_INPUT_EVENT % _encode_all((
                 self.prompt_name,
                 self.content_name,
                 call_center_system_prompt,
-            )
-            text_content_end = self.CONTENT_END_EVENT % (
+            ))
+            text_content_end = self.CONTENT_END_EVENT % _encode_all((
                 self.prompt_name,
                 self.content_name,
-            )
+            ))
 
             init_events = [
                 self.START_SESSION_EVENT,
@@ -265,9 +297,11 @@ class BedrockStreamManager:
                 text_content_end,
             ]
 
+            # Sent back to back with no pacing. Not gathered: concurrent sends on
+            # the input stream are not guaranteed to keep this order, and Bedrock
+            # rejects a session whose events arrive out of sequence
             for event in init_events:
                 await self.send_raw_event(event)
-                await asyncio.sleep(0.1)
 
             # Start listening for responses
             self.response_task = asyncio.create_task(self._process_responses())
@@ -275,8 +309,6 @@ class BedrockStreamManager:
             # Start processing audio input
             asyncio.create_task(self._process_audio_input())
 
-            await asyncio.sleep(0.1)
-
             debug_print("Stream initialized successfully")
             return self
         except Exception as e:
@@ -284,32 +316,39 @@ class BedrockStreamManager:
             print(f"Failed to initialize stream: {str(e)}")
             raise
 
-    async def send_raw_event(self, event_json):
-        """Send a raw event JSON to the Bedrock stream."""
+    async def send_raw_event(self, event_bytes):
+        """Send a raw event JSON (bytes) to the Bedrock stream."""
+        if await self.send_raw_event_bytes(event_bytes):
+            if len(event_bytes) > 200:
+                match = _EVENT_TYPE_RE.match(event_bytes)
+                event_type = match.group(1).decode("utf-8") if match else "unknown"
+                debug_print(f"Sent event type: {event_type}")
+            else:
+                debug_print(f"Sent event: {event_bytes.decode('utf-8')}")
+
+    async def send_raw_event_bytes(self, event_bytes):
+        """Send an encoded event without logging it; returns True on success."""
         if not self.stream_response or not self.is_active:
             debug_print("Stream not initialized or closed")
-            return
+            return False
 
         event = InvokeModelWithBidirectionalStreamInputChunk(
-            value=BidirectionalInputPayloadPart(bytes_=event_json.encode("utf-8"))
+            value=BidirectionalInputPayloadPart(bytes_=event_bytes)
         )
 
         try:
             await self.stream_response.input_stream.send(event)
-            if len(event_json) > 200:
-                event_type = json.loads(event_json).get("event", {}).keys()
-                debug_print(f"Sent event type: {list(event_type)}")
-            else:
-                debug_print(f"Sent event: {event_json}")
+            return True
         except Exception as e:
             debug_print(f"Error sending event: {str(e)}")
+            return False
 
     async def send_audio_content_start_event(self):
         """Send a content start event to the Bedrock stream."""
-        content_start_event = self.CONTENT_START_EVENT % (
+        content_start_event = self.CONTENT_START_EVENT % _encode_all((
             self.prompt_name,
             self.audio_content_name,
-        )
+        ))
         await self.send_raw_event(content_start_event)
 
     async def _process_audio_input(self):
@@ -317,21 +356,22 @@ class BedrockStreamManager:
         while self.is_active:
             try:
                 data = await self.audio_input_queue.get()
+                chunks = [data.get("audio_bytes")]
 
-                audio_bytes = data.get("audio_bytes")
+                # Coalesce frames that queued up behind this one into one event
+                while len(chunks) < AUDIO_INPUT_MAX_BATCH and not self.audio_input_queue.empty():
+                    chunks.append(self.audio_input_queue.get_nowait().get("audio_bytes"))
+
+                audio_bytes = chunks[0] if len(chunks) == 1 else b"".join(c for c in chunks if c)
                 if not audio_bytes:
                     debug_print("No audio bytes received")
                     continue
 
-                blob = base64.b64encode(audio_bytes)
-                audio_event = self.AUDIO_EVENT_TEMPLATE % (
-                    self.prompt_name,
-                    self.audio_content_name,
-                    blob.decode("utf-8"),
+                # One join sizes the payload once instead of building an intermediate
+                await self.send_raw_event_bytes(
+                    b"".join((self._audio_prefix, base64.b64encode(audio_bytes), self._audio_suffix))
                 )
 
-                await self.send_raw_event(audio_event)
-
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -339,7 +379,8 @@ class BedrockStreamManager:
 
     def add_audio_chunk(self, audio_bytes):
         """Add an audio chunk to the queue."""
-        self.audio_input_queue.put_nowait(
+        _put_drop_oldest(
+            self.audio_input_queue,
             {
                 "audio_bytes": audio_bytes,
                 "prompt_name": self.prompt_name,
@@ -353,39 +394,41 @@ class BedrockStreamManager:
             debug_print("Stream is not active")
             return
 
-        content_end_event = self.CONTENT_END_EVENT % (
-            self.prompt_name,
-            self.audio_content_name,
+        await self.send_raw_event_bytes(
+            self._render(self._content_end_tmpl, self.audio_content_name)
         )
-        await self.send_raw_event(content_end_event)
         debug_print("Audio ended")
 
     async def send_tool_start_event(self, content_name, tool_use_id):
         """Send a tool content start event to the Bedrock stream."""
-        content_start_event = self.TOOL_CONTENT_START_EVENT % (
-            self.prompt_name,
-            content_name,
-            tool_use_id,
+        debug_print(f"Sending tool start event: {content_name} for {tool_use_id}")
+        await self.send_raw_event_bytes(
+            self._render(self._tool_start_tmpl, content_name, tool_use_id)
         )
-        debug_print(f"Sending tool start event: {content_start_event}")
-        await self.send_raw_event(content_start_event)
 
     async def send_tool_result_event(self, content_name, tool_result):
         """Send a tool content event to the Bedrock stream."""
         tool_result_event = self.tool_result_event(
             content_name=content_name, content=tool_result, role="TOOL"
         )
-        debug_print(f"Sending tool result event: {tool_result_event}")
+        debug_print(f"Sending tool result event: {tool_result_event.decode('utf-8')}")
         await self.send_raw_event(tool_result_event)
 
     async def send_tool_content_end_event(self, content_name):
         """Send a tool content end event to the Bedrock stream."""
-        tool_content_end_event = self.CONTENT_END_EVENT % (
-            self.prompt_name,
-            content_name,
+        debug_print(f"Sending tool content end event: {content_name}")
+        await self.send_raw_event_bytes(self._render(self._content_end_tmpl, content_name))
+
+    async def send_tool_response(self, content_name, tool_use_id, tool_result):
+        """Send the tool contentStart, toolResult and contentEnd events back to back."""
+        events = (
+            self._render(self._tool_start_tmpl, content_name, tool_use_id),
+            self.tool_result_event(content_name=content_name, content=tool_result, role="TOOL"),
+            self._render(self._content_end_tmpl, content_name),
         )
-        debug_print(f"Sending tool content event: {tool_content_end_event}")
-        await self.send_raw_event(tool_content_end_event)
+        for event in events:
+            if not await self.send_raw_event_bytes(event):
+                break
 
     async def send_prompt_end_event(self):
         """Close the stream and clean up resources."""
@@ -393,7 +436,7 @@ class BedrockStreamManager:
             debug_print("Stream is not active")
             return
 
-        prompt_end_event = self.PROMPT_END_EVENT % (self.prompt_name)
+        prompt_end_event = self.PROMPT_END_EVENT % _encode_all((self.prompt_name,))
         await self.send_raw_event(prompt_end_event)
         debug_print("Prompt ended")
 
@@ -415,80 +458,45 @@ class BedrockStreamManager:
                     output = await self.stream_response.await_output()
                     result = await output[1].receive()
                     if result.value and result.value.bytes_:
+                        raw = result.value.bytes_
+
+                        # Fast path for audio frames: pull the base64 payload
+                        # without parsing the whole event
+                        if _AUDIO_OUTPUT_MARKER in raw:
+                            match = _AUDIO_CONTENT_RE.search(raw)
+                            if match:
+                                if self.audio_player:
+                                    self.audio_player.write(base64.b64decode(match.group(1)))
+                                continue
+
+                        # Barge-in sentinel as it appears JSON-escaped inside textOutput
+                        if _BARGE_IN_MARKER in raw:
+                            debug_print("Barge-in detected. Stopping audio output.")
+                            if self.audio_player:
+                                self.audio_player.clear()
+
                         try:
-                            response_data = result.value.bytes_.decode("utf-8")
-                            json_data = json.loads(response_data)
-
-                            if "event" in json_data:
-                                if "completionStart" in json_data["event"]:
-                                    debug_print(f"completionStart: {json_data['event']}")
-                                elif "contentStart" in json_data["event"]:
-                                    debug_print("Content start detected")
-                                    content_start = json_data["event"]["contentStart"]
-                                    self.role = content_start["role"]
-                                    if "additionalModelFields" in content_start:
-                                        try:
-                                            additional_fields = json.loads(
-                                                content_start["additionalModelFields"]
-                                            )
-                                            if (
-                                                additional_fields.get("generationStage")
-                                                == "SPECULATIVE"
-                                            ):
-                                                debug_print("Speculative content detected")
-                                                self.display_assistant_text = True
-                                            else:
-                                                self.display_assistant_text = False
-                                        except json.JSONDecodeError:
-                                            debug_print("Error parsing additionalModelFields")
-                                elif "textOutput" in json_data["event"]:
-                                    text_content = json_data["event"]["textOutput"]["content"]
-                                    role = json_data["event"]["textOutput"]["role"]
-                                    if '{ "interrupted" : true }' in text_content:
-                                        debug_print("Barge-in detected. Stopping audio output.")
-                                        self.barge_in = True
-
-                                    if self.role == "ASSISTANT" and self.display_assistant_text:
-                                        print(f"Assistant: {text_content}")
-                                    elif self.role == "USER":
-                                        print(f"User: {text_content}")
-                                elif "audioOutput" in json_data["event"]:
-                                    audio_content = json_data["event"]["audioOutput"]["content"]
-                                    audio_bytes = base64.b64decode(audio_content)
-                                    await self.audio_output_queue.put(audio_bytes)
-                                elif "toolUse" in json_data["event"]:
-                                    self.toolUseContent = json_data["event"]["toolUse"]
-                                    self.toolName = json_data["event"]["toolUse"]["toolName"]
-                                    self.toolUseId = json_data["event"]["toolUse"]["toolUseId"]
-                                    debug_print(f"Tool use detected: {self.toolName}, ID: {self.toolUseId}")
-                                elif (
-                                    "contentEnd" in json_data["event"]
-                                    and json_data["event"].get("contentEnd", {}).get("type") == "TOOL"
-                                ):
-                                    debug_print("Processing tool use and sending result")
-                                    self.handle_tool_request(
-                                        self.toolName,
-                                        self.toolUseContent,
-                                        self.toolUseId,
-                                    )
-                                    debug_print("Processing tool use asynchronously")
-                                elif "contentEnd" in json_data["event"]:
-                                    debug_print("Content end")
-                                elif "completionEnd" in json_data["event"]:
-                                    debug_print("End of response sequence")
-                                elif "usageEvent" in json_data["event"]:
-                                    debug_print(f"UsageEvent: {json_data['event']}")
-                            await self.output_queue.put(json_data)
+                            json_data = _loads(raw)
+
+                            event = json_data.get("event")
+                            if event:
+                                key = next(iter(event))
+                                handler = self._event_handlers.get(key)
+                                if handler:
+                                    handler(event[key])
+                            _put_drop_oldest(self.output_queue, json_data)
                         except json.JSONDecodeError:
-                            await self.output_queue.put({"raw_data": response_data})
+                            _put_drop_oldest(
+                                self.output_queue,
+                                {"raw_data": result.value.bytes_.decode("utf-8", errors="replace")}
+                            )
                 except StopAsyncIteration:
                     break
+                except ValidationException as e:
+                    print(f"Validation error: {e}")
+                    break
                 except Exception as e:
-                    if "ValidationException" in str(e):
-                        error_message = str(e)
-                        print(f"Validation error: {error_message}")
-                    else:
-                        print(f"Error receiving response: {e}")
+                    print(f"Error receiving response: {e}")
                     break
 
         except Exception as e:
@@ -496,9 +504,54 @@ class BedrockStreamManager:
         finally:
             self.is_active = False
 
+    def _on_completion_start(self, completion_start):
+        debug_print(f"completionStart: {completion_start}")
+
+    def _on_content_start(self, content_start):
+        debug_print("Content start detected")
+        self.role = content_start["role"]
+        if "additionalModelFields" in content_start:
+            # Only generationStage is needed, so match it instead of parsing the nested JSON
+            if _SPECULATIVE_RE.search(content_start["additionalModelFields"]):
+                debug_print("Speculative content detected")
+                self.display_assistant_text = True
+            else:
+                self.display_assistant_text = False
+
+    def _on_text_output(self, text_output):
+        text_content = text_output["content"]
+        if self.role == "ASSISTANT" and self.display_assistant_text:
+            print(f"Assistant: {text_content}")
+        elif self.role == "USER":
+            print(f"User: {text_content}")
+
+    def _on_audio_output(self, audio_output):
+        if self.audio_player:
+            self.audio_player.write(base64.b64decode(audio_output["content"]))
+
+    def _on_tool_use(self, tool_use):
+        self.toolUseContent = tool_use
+        self.toolName = tool_use["toolName"]
+        self.toolUseId = tool_use["toolUseId"]
+        debug_print(f"Tool use detected: {self.toolName}, ID: {self.toolUseId}")
+
+    def _on_content_end(self, content_end):
+        if content_end.get("type") == "TOOL":
+            debug_print("Processing tool use and sending result")
+            self.handle_tool_request(self.toolName, self.toolUseContent, self.toolUseId)
+            debug_print("Processing tool use asynchronously")
+        else:
+            debug_print("Content end")
+
+    def _on_completion_end(self, completion_end):
+        debug_print("End of response sequence")
+
+    def _on_usage_event(self, usage_event):
+        debug_print(f"UsageEvent: {usage_event}")
+
     def handle_tool_request(self, tool_name, tool_content, tool_use_id):
         """Handle a tool request asynchronously"""
-        tool_content_name = str(uuid.uuid4())
+        tool_content_name = f"{self._tool_content_prefix}{next(self._tool_content_ids)}"
 
         task = asyncio.create_task(
             self._execute_tool_and_send_result(
@@ -533,9 +586,7 @@ class BedrockStreamManager:
                 tool_name, tool_content
             )
 
-            await self.send_tool_start_event(content_name, tool_use_id)
-            await self.send_tool_result_event(content_name, tool_result)
-            await self.send_tool_content_end_event(content_name)
+            await self.send_tool_response(content_name, tool_use_id, tool_result)
 
             debug_print(f"Tool execution complete: {tool_name}")
         except Exception as e:
@@ -543,9 +594,7 @@ class BedrockStreamManager:
             try:
                 error_result = {"error": f"Tool execution failed: {str(e)}"}
 
-                await self.send_tool_start_event(content_name, tool_use_id)
-                await self.send_tool_result_event(content_name, error_result)
-                await self.send_tool_content_end_event(content_name)
+                await self.send_tool_response(content_name, tool_use_id, error_result)
             except Exception as send_error:
                 debug_print(f"Failed to send error response: {str(send_error)}")
 
@@ -5,8 +5,8 @@ Defines all available tools for call center operations
 import json
 
 
-def get_tool_schemas():
-    """Returns a list of all tool schema definitions for the call center agent"""
+def _build_tool_schemas():
+    """Builds the list of all tool schema definitions for the call center agent"""
 
     # Verify member by phone number or member ID
     verify_member_schema = json.dumps({
@@ -159,3 +159,12 @@ def get_tool_schemas():
             }
         }
     ]
+
+
+# Schemas are static, so serialize them once at import
+_TOOL_SCHEMAS = _build_tool_schemas()
+
+
+def get_tool_schemas():
+    """Returns a list of all tool schema definitions for the call center agent"""
+    return _TOOL_SCHEMAS
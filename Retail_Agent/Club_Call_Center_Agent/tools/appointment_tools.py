@@ -2,11 +2,22 @@
 Appointment Tools
 Tools for scheduling and checking appointments
 """
-import random
+import secrets
 from typing import Dict, Any
-from boto3.dynamodb.conditions import Attr
+from config.constants import INDEX_MEMBER_ID, INDEX_CONFIRMATION_NUMBER
 from tools.base_tool import BaseTool
 
+# Turns an ISO date (YYYY-MM-DD) into the compact form used in IDs
+_DASH_STRIP = str.maketrans('', '', '-')
+
+# ID prefixes for the bookable departments; other names fall back to their first 4 letters
+_DEPT_PREFIX = {
+    'TireCenter': 'TIRE',
+    'OpticalCenter': 'OPTI',
+    'HearingAidCenter': 'HEAR',
+    'Pharmacy': 'PHAR'
+}
+
 
 class ScheduleAppointmentTool(BaseTool):
     """Schedule an appointment at Tire, Optical, Hearing, or Pharmacy"""
@@ -31,24 +42,29 @@ class ScheduleAppointmentTool(BaseTool):
             if not all([member_id, department, service_type, appointment_date, appointment_time]):
                 return {"error": "memberId, department, serviceType, appointmentDate, and appointmentTime are required."}
 
-            # Generate appointment ID and confirmation number
-            appt_id = f"APPT-{department[:4].upper()}-{appointment_date.replace('-', '')}-{random.randint(100, 999)}"
-            confirmation = f"{department[:4].upper()}-{random.randint(10000, 99999)}"
-
-            # Create appointment
-            self.appointments_table.put_item(Item={
-                'appointmentId': appt_id,
-                'memberId': member_id,
-                'memberName': member_name or "Member",
-                'department': department,
-                'serviceType': service_type,
-                'appointmentDate': appointment_date,
-                'appointmentTime': appointment_time,
-                'duration': '1 hour',  # Default
-                'status': 'Confirmed',
-                'notes': notes,
-                'confirmationNumber': confirmation
-            })
+            prefix = _DEPT_PREFIX.get(department) or department[:4].upper()
+            date_part = appointment_date.translate(_DASH_STRIP)
+
+            def build_appointment():
+                # Generate appointment ID and confirmation number
+                return {
+                    'appointmentId': f"APPT-{prefix}-{date_part}-{secrets.randbelow(900) + 100}",
+                    'memberId': member_id,
+                    'memberName': member_name or "Member",
+                    'department': department,
+                    'serviceType': service_type,
+                    'appointmentDate': appointment_date,
+                    'appointmentTime': appointment_time,
+                    'duration': '1 hour',  # Default
+                    'status': 'Confirmed',
+                    'notes': notes,
+                    'confirmationNumber': f"{prefix}-{secrets.randbelow(90000) + 10000}"
+                }
+
+            # Create appointment, redrawing the IDs if the appointment ID is taken
+            appointment = self.put_new_item(self.appointments_table, 'appointmentId', build_appointment)
+            appt_id = appointment['appointmentId']
+            confirmation = appointment['confirmationNumber']
 
             return {
                 "success": True,
@@ -68,6 +84,37 @@ class CheckAppointmentTool(BaseTool):
         super().__init__(dynamodb)
         self.appointments_table = appointments_table
 
+    def _find_by_confirmation(self, confirmation_number):
+        """Return the appointment with this confirmation number, or None"""
+        response = self.appointments_table.query(
+            IndexName=INDEX_CONFIRMATION_NUMBER,
+            KeyConditionExpression='confirmationNumber = :c',
+            ExpressionAttributeValues={':c': confirmation_number},
+            Limit=1
+        )
+        items = response.get('Items', [])
+        return items[0] if items else None
+
+    def _find_latest_for_member(self, member_id, department):
+        """Return the member's most recent appointment (optionally in one department), or None"""
+        # Index is sorted by appointmentDate; read newest first. Limit applies
+        # before FilterExpression, so only cap the read when not filtering
+        query_kwargs = {
+            'IndexName': INDEX_MEMBER_ID,
+            'KeyConditionExpression': 'memberId = :m',
+            'ExpressionAttributeValues': {':m': member_id},
+            'ScanIndexForward': False
+        }
+        if department:
+            query_kwargs['FilterExpression'] = 'department = :d'
+            query_kwargs['ExpressionAttributeValues'][':d'] = department
+        else:
+            query_kwargs['Limit'] = 1
+
+        response = self.appointments_table.query(**query_kwargs)
+        items = response.get('Items', [])
+        return items[0] if items else None
+
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Check existing appointment by confirmation number or member ID.
@@ -82,49 +129,39 @@ class CheckAppointmentTool(BaseTool):
 
             # Search by confirmation number
             if confirmation_number:
-                response = self.appointments_table.scan(
-                    FilterExpression=Attr('confirmationNumber').eq(confirmation_number)
-                )
-
-                items = response.get('Items', [])
-                if not items:
+                item = self._find_by_confirmation(confirmation_number)
+                if item is not None:
+                    appt = self.convert_decimals(item)
+                    status = appt.get('status')
+                    date = appt.get('appointmentDate')
+                    time = appt.get('appointmentTime')
+                    dept = appt.get('department')
+                    service = appt.get('serviceType')
+
+                    if status == 'Ready':
+                        return {
+                            "found": True,
+                            "appointment": appt,
+                            "message": f"Your {dept} appointment for {service} is ready! Confirmation: {confirmation_number}"
+                        }
+                    else:
+                        return {
+                            "found": True,
+                            "appointment": appt,
+                            "message": f"Your {dept} appointment for {service} is scheduled for {date} at {time}. Confirmation: {confirmation_number}"
+                        }
+
+                # With both identifiers, a confirmation miss falls back to the member
+                if not member_id:
                     return {"found": False, "message": "Appointment not found with that confirmation number."}
 
-                appt = self.convert_decimals(items[0])
-                status = appt.get('status')
-                date = appt.get('appointmentDate')
-                time = appt.get('appointmentTime')
-                dept = appt.get('department')
-                service = appt.get('serviceType')
-
-                if status == 'Ready':
-                    return {
-                        "found": True,
-                        "appointment": appt,
-                        "message": f"Your {dept} appointment for {service} is ready! Confirmation: {confirmation_number}"
-                    }
-                else:
-                    return {
-                        "found": True,
-                        "appointment": appt,
-                        "message": f"Your {dept} appointment for {service} is scheduled for {date} at {time}. Confirmation: {confirmation_number}"
-                    }
-
             # Search by member ID
             if member_id:
-                filter_expr = Attr('memberId').eq(member_id)
-                if department:
-                    filter_expr = filter_expr & Attr('department').eq(department)
-
-                response = self.appointments_table.scan(FilterExpression=filter_expr)
-
-                items = response.get('Items', [])
-                if not items:
+                item = self._find_latest_for_member(member_id, department)
+                if item is None:
                     return {"found": False, "message": "No appointments found for this member."}
 
-                # Sort by date (most recent first)
-                items.sort(key=lambda x: x.get('appointmentDate', ''), reverse=True)
-                appt = self.convert_decimals(items[0])
+                appt = self.convert_decimals(item)
 
                 return {
                     "found": True,
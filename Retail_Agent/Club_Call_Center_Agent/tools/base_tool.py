@@ -2,14 +2,25 @@
 Base Tool
 Abstract base class for all call center tools
 """
+import asyncio
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from config.constants import CREATE_ID_MAX_ATTEMPTS
 
 
 class BaseTool(ABC):
     """Base class for all call center tools with common patterns"""
 
+    # Set by the tool processor to coalesce concurrent GetItems
+    batcher = None
+
+    # Set by the tool processor to run execute() on its bounded pool
+    executor = None
+
     def __init__(self, dynamodb):
         """
         Initialize base tool with DynamoDB resource
@@ -29,15 +40,112 @@ class BaseTool(ABC):
         Returns:
             Object with all Decimals converted to strings
         """
-        if isinstance(obj, list):
-            return [self.convert_decimals(item) for item in obj]
-        elif isinstance(obj, dict):
+        obj_type = type(obj)
+        if obj_type is dict:
             return {key: self.convert_decimals(value) for key, value in obj.items()}
-        elif isinstance(obj, Decimal):
+        elif obj_type is list:
+            return [self.convert_decimals(item) for item in obj]
+        elif obj_type is Decimal:
             return str(obj)
         else:
             return obj
 
+    def convert_decimal_fields(self, item: Dict[str, Any], keys) -> Dict[str, Any]:
+        """
+        Convert only the named top-level Decimal fields of a flat item to strings
+
+        A cheaper alternative to convert_decimals for projected items whose
+        numeric attributes are known up front.
+
+        Args:
+            item: Flat DynamoDB item
+            keys: Attribute names that may hold Decimals
+
+        Returns:
+            Copy of the item with those Decimals converted to strings
+        """
+        converted = dict(item)
+        for key in keys:
+            value = converted.get(key)
+            if type(value) is Decimal:
+                converted[key] = str(value)
+        return converted
+
+    def get_item(self, table, key: Dict[str, Any], projection: Optional[str] = None,
+                 names: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Fetch a single item by primary key
+
+        Goes through the shared batch coordinator when one is attached so that
+        lookups issued by concurrent tool calls share one BatchGetItem.
+
+        Args:
+            table: boto3 DynamoDB Table
+            key: Primary key of the item
+            projection: Optional ProjectionExpression; must include the key attributes
+            names: Optional ExpressionAttributeNames for the projection
+
+        Returns:
+            get_item-shaped response containing 'Item' when found
+        """
+        if self.batcher is not None:
+            return self.batcher.get_item(table, key, projection, names)
+
+        kwargs = {}
+        if projection:
+            kwargs['ProjectionExpression'] = projection
+            if names:
+                kwargs['ExpressionAttributeNames'] = names
+        return table.get_item(Key=key, **kwargs)
+
+    def put_new_item(self, table, key_name: str,
+                     build_item: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write a new item under a randomly generated key without overwriting
+
+        The put is conditional on the key not existing, so DynamoDB rejects a
+        colliding ID without a read first; build_item is then called again to
+        draw a fresh ID.
+
+        Args:
+            table: boto3 DynamoDB Table
+            key_name: Name of the table's partition key attribute
+            build_item: Returns a complete item with newly generated IDs
+
+        Returns:
+            The item that was written
+        """
+        for attempt in range(CREATE_ID_MAX_ATTEMPTS):
+            item = build_item()
+            try:
+                table.put_item(
+                    Item=item,
+                    ConditionExpression='attribute_not_exists(#k)',
+                    ExpressionAttributeNames={'#k': key_name}
+                )
+                return item
+            except ClientError as e:
+                if (e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException'
+                        or attempt == CREATE_ID_MAX_ATTEMPTS - 1):
+                    raise
+
+    async def aexecute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute tool logic from the event loop
+
+        Runs the blocking execute() on the tool executor (the loop's default
+        executor if none is attached). Tools backed by a native async client
+        can override this to await their I/O directly.
+
+        Args:
+            content_data: Dictionary containing tool parameters
+
+        Returns:
+            Dictionary containing tool execution results
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.execute, content_data)
+
     @abstractmethod
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """
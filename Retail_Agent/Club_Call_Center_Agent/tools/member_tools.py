@@ -3,17 +3,45 @@ Member Tools
 Tools for member verification
 """
 from typing import Dict, Any
-from boto3.dynamodb.conditions import Attr
+from config.constants import INDEX_PHONE_LAST4
 from tools.base_tool import BaseTool
 
+# Formatting characters dropped from spoken/typed phone numbers
+_PHONE_STRIP = str.maketrans('', '', '-() ')
+
+# Greeting for a verified member, filled from the member item
+_GREETING = "Hello {name}, how can I help you today?".format_map
+
 
 class VerifyMemberTool(BaseTool):
     """Verify member by phone number or member ID"""
 
+    # Only the fields the verification response uses
+    PROJECTION = "memberId, #n, phone, email, membershipType"
+    PROJECTION_NAMES = {"#n": "name"}
+
     def __init__(self, dynamodb, members_table):
         super().__init__(dynamodb)
         self.members_table = members_table
 
+    @staticmethod
+    def _digits(phone):
+        """Keep only the digits of a phone number"""
+        return "".join(c for c in phone if c.isdigit())
+
+    @staticmethod
+    def _verified(member):
+        """Build the verification response for a member item"""
+        return {
+            "verified": True,
+            "memberId": member['memberId'],
+            "name": member['name'],
+            "phone": member.get('phone'),
+            "email": member.get('email'),
+            "membershipType": member.get('membershipType'),
+            "message": _GREETING(member)
+        }
+
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Verify member by phone number or member ID.
@@ -28,40 +56,38 @@ class VerifyMemberTool(BaseTool):
 
             # Direct lookup by member ID
             if member_id:
-                response = self.members_table.get_item(Key={'memberId': member_id})
+                response = self.get_item(
+                    self.members_table,
+                    {'memberId': member_id},
+                    self.PROJECTION,
+                    self.PROJECTION_NAMES
+                )
                 if 'Item' in response:
                     member = response['Item']
-                    return {
-                        "verified": True,
-                        "memberId": member['memberId'],
-                        "name": member['name'],
-                        "phone": member.get('phone'),
-                        "email": member.get('email'),
-                        "membershipType": member.get('membershipType'),
-                        "message": f"Hello {member['name']}, how can I help you today?"
-                    }
-
-            # Scan by phone number
+                    return self._verified(member)
+
+            # Look up by the last 4 digits of the phone number
             if phone:
                 # Normalize phone number
-                phone_normalized = phone.replace('-', '').replace(' ', '').replace('(', '').replace(')', '')
+                phone_normalized = phone.translate(_PHONE_STRIP)
 
-                response = self.members_table.scan(
-                    FilterExpression=Attr('phone').contains(phone_normalized[-4:])  # Last 4 digits
+                response = self.members_table.query(
+                    IndexName=INDEX_PHONE_LAST4,
+                    KeyConditionExpression='phoneLast4 = :p',
+                    ExpressionAttributeValues={':p': phone_normalized[-4:]},
+                    ProjectionExpression=self.PROJECTION,
+                    ExpressionAttributeNames=self.PROJECTION_NAMES,
+                    Limit=5
                 )
 
                 items = response.get('Items', [])
                 if items:
-                    member = items[0]  # Take first match
-                    return {
-                        "verified": True,
-                        "memberId": member['memberId'],
-                        "name": member['name'],
-                        "phone": member.get('phone'),
-                        "email": member.get('email'),
-                        "membershipType": member.get('membershipType'),
-                        "message": f"Hello {member['name']}, how can I help you today?"
-                    }
+                    # Several members can share the last 4 digits; prefer a full-number match
+                    member = next(
+                        (m for m in items if self._digits(m.get('phone', '')).endswith(self._digits(phone_normalized))),
+                        items[0]
+                    )
+                    return self._verified(member)
 
             return {"verified": False, "message": "Member not found. Please verify the information and try again."}
 
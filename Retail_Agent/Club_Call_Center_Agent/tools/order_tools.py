@@ -3,11 +3,25 @@ Order Tools
 Tools for managing curbside orders, specialty orders, and cake orders
 """
 import datetime
-import random
+import secrets
+import types
 from decimal import Decimal
 from typing import Dict, Any
-from boto3.dynamodb.conditions import Attr
+from config.constants import INDEX_MEMBER_ID
 from tools.base_tool import BaseTool
+from utils.clock import today_and_day
+
+# Cake prices by size in integer cents; read-only so no caller can alter them.
+# Converted to Decimal only when written to DynamoDB
+CAKE_PRICES = types.MappingProxyType({
+    "Quarter Sheet": 2499,
+    "Half Sheet": 3499,
+    "Full Sheet": 5499
+})
+DEFAULT_CAKE_PRICE = CAKE_PRICES["Half Sheet"]
+
+# Turns an ISO date (YYYY-MM-DD) into the compact form used in IDs
+_DASH_STRIP = str.maketrans('', '', '-')
 
 
 class CheckCurbsideOrderTool(BaseTool):
@@ -30,7 +44,7 @@ class CheckCurbsideOrderTool(BaseTool):
 
             # Direct order lookup
             if order_id:
-                response = self.curbside_table.get_item(Key={'orderId': order_id})
+                response = self.get_item(self.curbside_table, {'orderId': order_id})
                 if 'Item' in response:
                     order = self.convert_decimals(response['Item'])
                     status = order.get('status')
@@ -66,16 +80,19 @@ class CheckCurbsideOrderTool(BaseTool):
 
             # Search by member ID - find most recent order
             if member_id:
-                response = self.curbside_table.scan(
-                    FilterExpression=Attr('memberId').eq(member_id)
+                # Index is sorted by orderDate; read newest first and stop at one
+                response = self.curbside_table.query(
+                    IndexName=INDEX_MEMBER_ID,
+                    KeyConditionExpression='memberId = :m',
+                    ExpressionAttributeValues={':m': member_id},
+                    ScanIndexForward=False,
+                    Limit=1
                 )
 
                 items = response.get('Items', [])
                 if not items:
                     return {"found": False, "message": "No curbside orders found for this member."}
 
-                # Sort by order date (most recent first)
-                items.sort(key=lambda x: x.get('orderDate', ''), reverse=True)
                 order = self.convert_decimals(items[0])
 
                 status = order.get('status')
@@ -121,7 +138,7 @@ class CheckSpecialtyOrderTool(BaseTool):
 
             # Direct order lookup
             if order_id:
-                response = self.specialty_table.get_item(Key={'orderId': order_id})
+                response = self.get_item(self.specialty_table, {'orderId': order_id})
                 if 'Item' in response:
                     order = self.convert_decimals(response['Item'])
                     status = order.get('status')
@@ -149,16 +166,19 @@ class CheckSpecialtyOrderTool(BaseTool):
 
             # Search by member ID
             if member_id:
-                response = self.specialty_table.scan(
-                    FilterExpression=Attr('memberId').eq(member_id) & Attr('orderType').eq(order_type)
+                # Index is sorted by pickupDate; no Limit, since it applies before the filter
+                response = self.specialty_table.query(
+                    IndexName=INDEX_MEMBER_ID,
+                    KeyConditionExpression='memberId = :m',
+                    FilterExpression='orderType = :t',
+                    ExpressionAttributeValues={':m': member_id, ':t': order_type},
+                    ScanIndexForward=False
                 )
 
                 items = response.get('Items', [])
                 if not items:
                     return {"found": False, "message": f"No {order_type} orders found for this member."}
 
-                # Sort by pickup date (most recent first)
-                items.sort(key=lambda x: x.get('pickupDate', ''), reverse=True)
                 order = self.convert_decimals(items[0])
 
                 status = order.get('status')
@@ -203,7 +223,7 @@ class CreateCakeOrderTool(BaseTool):
                 return {"error": "memberId, size, flavor, and pickupDate are required."}
 
             # Validate 48-hour lead time
-            today = datetime.date.today()
+            today, _ = today_and_day()
             try:
                 pickup = datetime.datetime.strptime(pickup_date, '%Y-%m-%d').date()
                 days_until = (pickup - today).days
@@ -216,43 +236,44 @@ class CreateCakeOrderTool(BaseTool):
             except ValueError:
                 return {"error": "Invalid pickup date format. Use YYYY-MM-DD."}
 
-            # Generate order ID and confirmation
-            order_id = f"CAKE-{today.strftime('%Y%m%d')}-{random.randint(100, 999)}"
-            confirmation = f"CAKE-{random.randint(10000, 99999)}"
+            today_iso = today.isoformat()
+            order_prefix = f"CAKE-{today_iso.translate(_DASH_STRIP)}-"
 
             # Calculate price based on size
-            prices = {
-                "Quarter Sheet": Decimal("24.99"),
-                "Half Sheet": Decimal("34.99"),
-                "Full Sheet": Decimal("54.99")
-            }
-            price = prices.get(size, Decimal("34.99"))
-
-            # Create order
-            self.specialty_table.put_item(Item={
-                'orderId': order_id,
-                'memberId': member_id,
-                'memberName': member_name or "Member",
-                'orderType': 'Cake',
-                'orderDate': today.strftime('%Y-%m-%d'),
-                'pickupDate': pickup_date,
-                'pickupTime': pickup_time,
-                'status': 'In Progress',
-                'details': {
-                    'size': size,
-                    'flavor': flavor,
-                    'inscription': inscription,
-                    'decorations': decorations
-                },
-                'price': price,
-                'confirmationNumber': confirmation
-            })
+            price_cents = CAKE_PRICES.get(size, DEFAULT_CAKE_PRICE)
+            price = f"{price_cents // 100}.{price_cents % 100:02d}"
+
+            def build_order():
+                # Generate order ID and confirmation
+                return {
+                    'orderId': f"{order_prefix}{secrets.randbelow(900) + 100}",
+                    'memberId': member_id,
+                    'memberName': member_name or "Member",
+                    'orderType': 'Cake',
+                    'orderDate': today_iso,
+                    'pickupDate': pickup_date,
+                    'pickupTime': pickup_time,
+                    'status': 'In Progress',
+                    'details': {
+                        'size': size,
+                        'flavor': flavor,
+                        'inscription': inscription,
+                        'decorations': decorations
+                    },
+                    'price': Decimal(price_cents) / 100,
+                    'confirmationNumber': f"CAKE-{secrets.randbelow(90000) + 10000}"
+                }
+
+            # Create order, redrawing the IDs if the order ID is taken
+            order = self.put_new_item(self.specialty_table, 'orderId', build_order)
+            order_id = order['orderId']
+            confirmation = order['confirmationNumber']
 
             return {
                 "success": True,
                 "orderId": order_id,
                 "confirmationNumber": confirmation,
-                "price": str(price),
+                "price": price,
                 "message": f"Cake order created successfully! {size} {flavor} cake ready for pickup on {pickup_date} at {pickup_time}. Your confirmation number is {confirmation}. Total: ${price}"
             }
 
@@ -2,10 +2,26 @@
 Store Tools
 Tools for store hours and inventory checks
 """
-import datetime
+import re
+import threading
+from collections import Counter
 from typing import Dict, Any
-from boto3.dynamodb.conditions import Attr
+from cachetools import TTLCache
+from config.constants import STORE_INFO_CACHE_MAXSIZE, STORE_INFO_CACHE_TTL_SECONDS
 from tools.base_tool import BaseTool
+from utils.clock import today_and_day
+
+# Product names are indexed by these lowercase word tokens (db_setup writes the same tokens)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# Reply for the default "today" query
+_TODAY_MESSAGE = "Today ({day}), we're open {hours}.".format_map
+
+
+def product_name_tokens(name):
+    """Split a product name into its distinct lowercase word tokens"""
+    return list(dict.fromkeys(_TOKEN_RE.findall(name.lower())))
 
 
 class CheckStoreHoursTool(BaseTool):
@@ -15,6 +31,33 @@ class CheckStoreHoursTool(BaseTool):
         super().__init__(dynamodb)
         self.store_info_table = store_info_table
 
+        # Store records keyed by (storeId, projection); execute() runs on worker threads
+        self._store_cache = TTLCache(maxsize=STORE_INFO_CACHE_MAXSIZE, ttl=STORE_INFO_CACHE_TTL_SECONDS)
+        self._store_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _projection(query_type, department):
+        """Attributes of the store record needed to answer a query type"""
+        if query_type in ("today", "regular") or not query_type:
+            return "storeId, storeName, regularHours", None
+        if query_type == "holiday":
+            return "storeId, storeName, holidayHours", None
+        if query_type == "department" and department:
+            return "storeId, departments.#d", {"#d": department}
+        return "storeId", None
+
+    def _get_store(self, store_id, projection, names):
+        """Return the (projected) store record, reading DynamoDB at most once per TTL"""
+        cache_key = (store_id, projection, tuple(sorted(names.items())) if names else ())
+        with self._store_cache_lock:
+            store = self._store_cache.get(cache_key)
+        if store is None:
+            store = self.get_item(self.store_info_table, {'storeId': store_id}, projection, names).get('Item')
+            if store is not None:
+                with self._store_cache_lock:
+                    self._store_cache[cache_key] = store
+        return store
+
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Check store hours - regular, holiday, department-specific, or today's hours.
@@ -25,19 +68,14 @@ class CheckStoreHoursTool(BaseTool):
             department = content_data.get("department")  # TireCenter, OpticalCenter, etc.
             specific_date = content_data.get("date")  # For checking specific dates
 
-            response = self.store_info_table.get_item(Key={'storeId': store_id})
-
-            if 'Item' not in response:
+            store = self._get_store(store_id, *self._projection(query_type, department))
+            if store is None:
                 return {"error": "Store information not found."}
 
-            store = response['Item']
-
-            # Determine today's day of week
-            today = datetime.date.today()
-            day_name = today.strftime('%A')
-
             # Query type: TODAY
             if query_type == "today" or not query_type:
+                # Only this branch needs today's day of week
+                _, day_name = today_and_day()
                 regular_hours = store.get('regularHours', {})
                 today_hours = regular_hours.get(day_name, 'Not available')
 
@@ -46,7 +84,7 @@ class CheckStoreHoursTool(BaseTool):
                     "storeName": store.get('storeName'),
                     "today": day_name,
                     "hours": today_hours,
-                    "message": f"Today ({day_name}), we're open {today_hours}."
+                    "message": _TODAY_MESSAGE({"day": day_name, "hours": today_hours})
                 }
 
             # Query type: REGULAR
@@ -96,9 +134,34 @@ class CheckStoreHoursTool(BaseTool):
 class CheckInventoryTool(BaseTool):
     """Check if an item is in stock, get aisle location, and price"""
 
-    def __init__(self, dynamodb, inventory_table):
+    # Only the fields the stock response uses
+    PROJECTION = "sku, productName, inStock, quantity, aisleLocation, price, expectedRestock"
+    # The projected attributes that come back as Decimal
+    NUMERIC_FIELDS = ("quantity", "price")
+
+    def __init__(self, dynamodb, inventory_table, search_table):
         super().__init__(dynamodb)
         self.inventory_table = inventory_table
+        self.search_table = search_table
+
+    def _search_sku(self, product_name):
+        """
+        Find the SKU whose name shares the most tokens with the search phrase,
+        querying the token table once per token instead of scanning inventory
+        """
+        hits = Counter()
+        for token in product_name_tokens(product_name):
+            response = self.search_table.query(
+                KeyConditionExpression='#t = :t',
+                ExpressionAttributeNames={'#t': 'token'},
+                ExpressionAttributeValues={':t': token},
+                ProjectionExpression='sku'
+            )
+            hits.update(item['sku'] for item in response.get('Items', []))
+        if not hits:
+            return None
+        # Most matching tokens wins; ties go to the lowest SKU for a stable answer
+        return min(hits, key=lambda s: (-hits[s], s))
 
     def execute(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -114,11 +177,12 @@ class CheckInventoryTool(BaseTool):
 
             # Direct SKU lookup
             if sku:
-                response = self.inventory_table.get_item(Key={'sku': sku})
+                response = self.get_item(self.inventory_table, {'sku': sku}, self.PROJECTION)
                 if 'Item' in response:
-                    item = self.convert_decimals(response['Item'])
+                    # Compare quantity as a number before it is stringified for the response
+                    quantity = response['Item'].get('quantity', 0)
+                    item = self.convert_decimal_fields(response['Item'], self.NUMERIC_FIELDS)
                     in_stock = item.get('inStock', False)
-                    quantity = item.get('quantity', 0)
 
                     if in_stock and quantity > 0:
                         return {
@@ -137,23 +201,23 @@ class CheckInventoryTool(BaseTool):
                             "message": f"{item['productName']} is currently out of stock.{restock_msg}"
                         }
 
-            # Search by product name (partial match)
+            # Search by product name (word match through the token table)
             if product_name:
-                response = self.inventory_table.scan(
-                    FilterExpression=Attr('productName').contains(product_name)
+                match_sku = self._search_sku(product_name)
+                response = (
+                    self.get_item(self.inventory_table, {'sku': match_sku}, self.PROJECTION)
+                    if match_sku else {}
                 )
-
-                items = response.get('Items', [])
-                if not items:
+                if 'Item' not in response:
                     return {
                         "found": False,
                         "message": f"No products found matching '{product_name}'. Can you provide more details or the SKU?"
                     }
 
-                # Return first match
-                item = self.convert_decimals(items[0])
+                # Compare quantity as a number before it is stringified for the response
+                quantity = response['Item'].get('quantity', 0)
+                item = self.convert_decimal_fields(response['Item'], self.NUMERIC_FIELDS)
                 in_stock = item.get('inStock', False)
-                quantity = item.get('quantity', 0)
 
                 if in_stock and quantity > 0:
                     return {
@@ -1,8 +1,9 @@
 """
 Utils Module
-Utility functions for logging and timing
+Utility functions for logging, timing and the current date
 """
 from utils.logging import debug_print
 from utils.timing import time_it, time_it_async
+from utils.clock import today_and_day
 
-__all__ = ["debug_print", "time_it", "time_it_async"]
+__all__ = ["debug_print", "time_it", "time_it_async", "today_and_day"]
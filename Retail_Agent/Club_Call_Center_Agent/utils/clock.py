@@ -0,0 +1,23 @@
+"""
+Clock Utilities
+Cached current date for tools that read it on every call
+"""
+import datetime
+import time
+
+from config.constants import TODAY_CACHE_TTL_SECONDS
+
+# (monotonic time checked, date, weekday name); replaced as a whole so threads see a consistent tuple
+_today = (0.0, None, None)
+
+
+def today_and_day():
+    """Return today's date and weekday name, recomputed at most once per TTL"""
+    global _today
+    now = time.monotonic()
+    checked, today, day_name = _today
+    if today is None or now - checked > TODAY_CACHE_TTL_SECONDS:
+        today = datetime.date.today()
+        day_name = today.strftime('%A')
+        _today = (now, today, day_name)
+    return today, day_name
@@ -1,4 +1,9 @@
 import ast
+import html
+import os
+import re
+from collections import deque, namedtuple
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
@@ -9,23 +14,111 @@ from streamlit_autorefresh import st_autorefresh
 
 DEFAULT_LOG_PATH = "assistant.log"
 MAX_EVENTS = 300  # only display last N parsed events
+READ_CHUNK_SIZE = 64 * 1024  # bytes read from the log per call
+COLD_START_WINDOW = 256 * 1024  # bytes parsed from the end of the log on first load
+
+# One pass classifies a log line; the named group that matched is the event
+# kind. Tool markers are matched case-insensitively, everything else exactly.
+_LINE_RE = re.compile(
+    r"(?P<user>User:)"
+    r"|(?P<assistant>Assistant:)"
+    r"|(?P<tool>(?i:tool(?:_?use|[ _]call|invocation| ?:| use ?:)))"
+    r"|(?P<usage>UsageEvent:)"
+    r"|(?P<completion_start>completionStart)"
+    r"|(?P<barge_in>Barge-in detected)"
+    r"|(?P<content_start>Content start detected)"
+    r"|(?P<content_end>Content end)"
+)
 
-# Strings that indicate a tool usage line
-TOOL_KEYWORDS = [
-    "tooluse",
-    "tool_use",
-    "tool call",
-    "tool_call",
-    "tool:",
-    "tool :",
-    "tool use:",
-    "tool use :",
-    "toolinvocation",
-]
+# Leading labels stripped from tool lines by extract_tool_message
+_TOOL_PREFIXES = ("tool:", "tool use:", "tool use", "tool call:", "tool call")
+
+# UsageEvent lines are logged as a dict repr. These pull out the handful of
+# fields the viewer shows (the cumulative 'total' counts, not the 'delta')
+# without building the whole dict; parse_usage_dict is the fallback.
+_USAGE_RE = re.compile(
+    r"'completionId':\s*'(?P<completion_id>[^']*)'"
+    r".*?'total':\s*\{'input':\s*\{(?P<input>[^}]*)\},\s*'output':\s*\{(?P<output>[^}]*)\}"
+    r".*?'totalTokens':\s*(?P<total_tokens>\d+)"
+)
+_TOKEN_COUNT_RE = re.compile(r"'(?:speech|text)Tokens':\s*(\d+)")
+
+# Color and icon per tool, keyed by normalized tool name
+TOOL_STYLES = {
+    "verifymember": ("#064e3b", "🔐"),  # Dark green for verification
+    "modifymembership": ("#064e3b", "🔐"),
+    "addhouseholdmember": ("#064e3b", "🔐"),
+    "removehouseholdmember": ("#064e3b", "🔐"),
+    "verifyreturnitem": ("#7c2d12", "↩️"),  # Dark orange for returns
+    "initiatereturn": ("#7c2d12", "↩️"),
+    "lookuptransaction": ("#831843", "⚠️"),  # Dark pink for transaction issues
+    "processtransactionissue": ("#831843", "⚠️"),
+    "filecomplaint": ("#3f1d38", "📝"),  # Dark purple for complaints
+}
+DEFAULT_TOOL_STYLE = ("#1e3a8a", "🔧")  # Default blue
+_TOOL_NAME_RE = re.compile(
+    "|".join(sorted(TOOL_STYLES, key=len, reverse=True)), re.IGNORECASE
+)
+
+# Fixed labels for marker lines
+EVENT_LABELS = {
+    "completion_start": "Completion started",
+    "barge_in": "Barge-in detected (member interrupted)",
+    "content_start": "Content start detected",
+    "content_end": "Content end",
+}
+
+# HTML templates for the conversation view, keyed by event type.
+# Values substituted into them must already be HTML-escaped.
+CHAT_TEMPLATES = {
+    "user": """
+<div style="padding: 10px 14px; margin-bottom: 10px; border-radius: 10px; background-color: #1e3a8a; border-left: 4px solid #3b82f6;">
+  <div style="font-size: 0.75rem; opacity: 0.8; color: #93c5fd;">Member{time}</div>
+  <div style="margin-top: 6px; color: #e0e7ff; font-size: 0.95rem;">{msg}</div>
+</div>
+""",
+    "assistant": """
+<div style="padding: 10px 14px; margin-bottom: 10px; border-radius: 10px; background-color: #0f172a; border-left: 4px solid #64748b;">
+  <div style="font-size: 0.75rem; opacity: 0.8; color: #94a3b8;">Kiosk Assistant{time}</div>
+  <div style="margin-top: 6px; color: #cbd5e1; font-size: 0.95rem;">{msg}</div>
+</div>
+""",
+    "tool": """
+<div style="padding: 8px 12px; margin-bottom: 8px; border-radius: 8px; background-color: {bg_color}; border-left: 3px solid rgba(255,255,255,0.3);">
+  <div style="font-size: 0.75rem; opacity: 0.85; color: #d1d5db;">{icon} Tool Execution{time}</div>
+  <div style="font-size: 0.88rem; margin-top: 4px; color: #f3f4f6; font-family: monospace;">{msg}</div>
+</div>
+""",
+    "event": """
+<div style="font-size: 0.72rem; opacity: 0.5; margin: 4px 0; color: #6b7280;">
+  ⚡ Event: {msg}{time}
+</div>
+""",
+}
+
+USAGE_TEMPLATE = """
+<div style="padding: 8px 12px; margin-bottom: 8px; border-radius: 8px; background-color: #0c1222; border: 1px solid #1e293b;">
+  <div style="font-size: 0.8rem; opacity: 0.7; color: #94a3b8;">Usage Metrics{time}</div>
+  <div style="font-size: 0.88rem; margin-top: 6px; color: #e2e8f0;">
+    <b style="color: #60a5fa;">Total: {total} tokens</b><br/>
+    <span style="color: #86efac;">Input: {input}</span> •
+    <span style="color: #fbbf24;">Output: {output}</span><br/>
+    <span style="font-size: 0.75rem; opacity: 0.6;">Completion ID: <code>{completion_id}</code></span>
+  </div>
+</div>
+"""
 
 
 # --------------- PARSING ---------------
 
+# One parsed log line. Fields that don't apply to an event type stay None.
+Event = namedtuple(
+    "Event",
+    "type time message label completion_id input_tokens output_tokens total_tokens"
+    " tool_key",
+    defaults=(None,) * 7,
+)
+
 
 def parse_timestamp_and_rest(line: str):
     """
@@ -58,169 +151,232 @@ def parse_usage_dict(text: str) -> Optional[Dict[str, Any]]:
     return d
 
 
-def is_tool_line(text: str) -> bool:
-    """Heuristic: does this line look like tool usage?"""
-    lower = text.lower()
-    return any(k in lower for k in TOOL_KEYWORDS)
-
-
 def extract_tool_message(text: str) -> str:
     """
     Try to strip leading 'Tool:' or similar; otherwise return full text.
     """
     stripped = text.strip()
-    lower = stripped.lower()
-
-    for prefix in ["tool:", "tool use:", "tool use", "tool call:", "tool call"]:
-        if lower.startswith(prefix):
-            parts = stripped.split(":", 1)
-            if len(parts) == 2:
-                return parts[1].strip() or stripped
+    if stripped.lower().startswith(_TOOL_PREFIXES):
+        parts = stripped.split(":", 1)
+        if len(parts) == 2:
+            return parts[1].strip() or stripped
     return stripped
 
 
-def parse_line_to_event(line: str) -> Optional[Dict[str, Any]]:
+@lru_cache(maxsize=4096)
+def parse_line_to_event(line: str) -> Optional[Event]:
     """
-    Convert a single log line into a structured event:
+    Convert a single log line into a structured Event:
     - type: 'user', 'assistant', 'event', 'usage', 'tool'
-    - time: timestamp string (may be None for bare User/Assistant lines)
-    - message / label / details...
+    - time: timestamp string (None for bare lines without a timestamp)
+    - message / label / token counts, depending on the type
+
+    Memoized on the raw line; Events are immutable so the cached copy is
+    safe to share.
     """
-    line = line.rstrip("\n")
-    if not line:
+    stripped = line.strip()
+    m = _LINE_RE.search(stripped)
+    if m is None:
+        # Ignore everything else
         return None
 
-    stripped = line.strip()
+    kind = m.lastgroup
 
-    # --- 1) Bare User/Assistant lines (NO timestamp) ---
-    if stripped.startswith("User:"):
-        msg = stripped.split("User:", 1)[1].strip()
-        return {
-            "type": "user",
-            "time": None,
-            "message": msg,
-        }
+    # Bare lines start with their marker and carry no timestamp
+    if m.start() == 0:
+        ts, rest = None, stripped
+    else:
+        ts, rest = parse_timestamp_and_rest(line)
+
+    if kind == "user" or kind == "assistant":
+        return Event(kind, ts, message=stripped[m.end():].strip())
+
+    if kind == "tool":
+        message = extract_tool_message(rest)
+        tool = _TOOL_NAME_RE.search(message)
+        return Event(
+            "tool",
+            ts,
+            message=message,
+            tool_key=tool.group(0).lower() if tool else None,
+        )
 
-    if stripped.startswith("Assistant:"):
-        msg = stripped.split("Assistant:", 1)[1].strip()
-        return {
-            "type": "assistant",
-            "time": None,
-            "message": msg,
-        }
+    if kind == "usage":
+        input_tokens = output_tokens = total_tokens = None
+        completion_id = None
 
-    # Bare tool line without timestamp
-    if is_tool_line(stripped):
-        return {
-            "type": "tool",
-            "time": None,
-            "message": extract_tool_message(stripped),
-        }
+        m = _USAGE_RE.search(rest)
+        if m:
+            completion_id = m.group("completion_id")
+            input_tokens = sum(map(int, _TOKEN_COUNT_RE.findall(m.group("input"))))
+            output_tokens = sum(map(int, _TOKEN_COUNT_RE.findall(m.group("output"))))
+            total_tokens = int(m.group("total_tokens"))
+        else:
+            # Unexpected layout: fall back to a full parse of the dict
+            usage_dict = parse_usage_dict(rest)
+            if usage_dict and "usageEvent" in usage_dict:
+                ue = usage_dict["usageEvent"]
+                completion_id = ue.get("completionId")
+                total = ue.get("details", {}).get("total", {})
+                inp = total.get("input", {})
+                out = total.get("output", {})
+
+                input_tokens = (inp.get("speechTokens", 0) or 0) + (
+                    inp.get("textTokens", 0) or 0
+                )
+                output_tokens = (out.get("speechTokens", 0) or 0) + (
+                    out.get("textTokens", 0) or 0
+                )
+                total_tokens = ue.get("totalTokens")
+
+        return Event(
+            "usage",
+            ts,
+            completion_id=completion_id,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=total_tokens,
+        )
 
-    # --- 2) Timestamped lines ---
-    ts, rest = parse_timestamp_and_rest(line)
+    # Completion start, barge-in and content markers
+    return Event("event", ts, label=EVENT_LABELS[kind])
 
-    # User speech/text embedded in a timestamped line
-    if "User:" in rest:
-        msg = rest.split("User:", 1)[1].strip()
-        return {
-            "type": "user",
-            "time": ts,
-            "message": msg,
-        }
 
-    # Assistant speech/text embedded in a timestamped line
-    if "Assistant:" in rest:
-        msg = rest.split("Assistant:", 1)[1].strip()
-        return {
-            "type": "assistant",
-            "time": ts,
-            "message": msg,
-        }
+def _read_events(
+    path: str, offset: int, events: deque, skip_partial: bool = False
+) -> int:
+    """
+    Parse complete lines from ``offset`` to EOF into ``events`` and return
+    the offset just past the last complete line. A trailing partial line is
+    left for the next read.
 
-    # Tool usage embedded in a timestamped line
-    if is_tool_line(rest):
-        return {
-            "type": "tool",
-            "time": ts,
-            "message": extract_tool_message(rest),
-        }
+    With ``skip_partial`` the line that ``offset`` falls inside is dropped,
+    for reads that start at an arbitrary byte position.
+    """
+    with open(path, "rb", buffering=READ_CHUNK_SIZE) as f:
+        if skip_partial and offset:
+            f.seek(offset - 1)
+            f.readline()
+            offset = f.tell()
+        else:
+            f.seek(offset)
+
+        buf = b""
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            *lines, buf = (buf + chunk).split(b"\n")
+            for raw in lines:
+                ev = parse_line_to_event(raw.decode("utf-8", errors="ignore"))
+                if ev is not None:
+                    events.append(ev)
+                offset += len(raw) + 1
 
-    # Usage events
-    if "UsageEvent:" in rest:
-        usage_dict = parse_usage_dict(rest)
-        input_tokens = output_tokens = total_tokens = None
-        completion_id = None
+    return offset
 
-        if usage_dict and "usageEvent" in usage_dict:
-            ue = usage_dict["usageEvent"]
-            completion_id = ue.get("completionId")
-            total = ue.get("details", {}).get("total", {})
-            inp = total.get("input", {})
-            out = total.get("output", {})
 
-            input_tokens = (inp.get("speechTokens", 0) or 0) + (
-                inp.get("textTokens", 0) or 0
-            )
-            output_tokens = (out.get("speechTokens", 0) or 0) + (
-                out.get("textTokens", 0) or 0
-            )
-            total_tokens = ue.get("totalTokens")
-
-        return {
-            "type": "usage",
-            "time": ts,
-            "completion_id": completion_id,
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
-            "total_tokens": total_tokens,
-        }
+def tail_log_file(path: str, state) -> List[Event]:
+    """
+    Parse only the lines appended to the log since the previous refresh.
 
-    # Completion start
-    if "completionStart" in rest:
-        return {"type": "event", "time": ts, "label": "Completion started"}
+    The read offset and the last MAX_EVENTS events are kept in ``state``
+    (normally ``st.session_state``). Rotation or truncation of the log
+    resets the tail to the new file. On a fresh tail only the end of the
+    log is parsed, widening the window until it yields MAX_EVENTS events
+    or reaches the start of the file.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return []
 
-    # Barge-in
-    if "Barge-in detected" in rest:
-        return {
-            "type": "event",
-            "time": ts,
-            "label": "Barge-in detected (member interrupted)",
+    tail = state.get("log_tail")
+    if (
+        tail is None
+        or tail["path"] != path
+        or tail["inode"] != stat.st_ino
+        or stat.st_size < tail["offset"]
+    ):
+        window = COLD_START_WINDOW
+        while True:
+            start = max(0, stat.st_size - window)
+            events = deque(maxlen=MAX_EVENTS)
+            offset = _read_events(path, start, events, skip_partial=True)
+            if start == 0 or len(events) == MAX_EVENTS:
+                break
+            window *= 2
+
+        tail = {
+            "path": path,
+            "inode": stat.st_ino,
+            "offset": offset,
+            "events": events,
         }
+        state["log_tail"] = tail
+    elif stat.st_size > tail["offset"]:
+        tail["offset"] = _read_events(path, tail["offset"], tail["events"])
 
-    # Content markers
-    if "Content start detected" in rest:
-        return {"type": "event", "time": ts, "label": "Content start detected"}
-
-    if "Content end" in rest:
-        return {"type": "event", "time": ts, "label": "Content end"}
+    return list(tail["events"])
 
-    # Ignore everything else
-    return None
 
-
-def parse_log_file(
-    path: str, limit: Optional[int] = MAX_EVENTS
-) -> List[Dict[str, Any]]:
+def build_view(events: List[Event], show_events: bool) -> Dict[str, Any]:
     """
-    Read the log and turn it into a list of structured events.
-    Only keep the last `limit` interesting events.
+    Derive the summary counts and the conversation/usage HTML from events.
     """
-    events: List[Dict[str, Any]] = []
-
-    try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                ev = parse_line_to_event(line)
-                if ev is not None:
-                    events.append(ev)
-    except FileNotFoundError:
-        return []
+    # Bucket events in a single pass
+    usage_events, chat_events, tool_events, member_interactions = [], [], [], []
+    for e in events:
+        etype = e.type
+        if etype == "usage":
+            usage_events.append(e)
+            continue
+        chat_events.append(e)
+        if etype == "tool":
+            tool_events.append(e)
+        elif etype == "user":
+            member_interactions.append(e)
+
+    html_parts = []
+    for ev in chat_events:
+        etype = ev.type
+        if etype == "event" and not show_events:
+            continue
+
+        time_str = ev.time or ""
+        fields = {
+            "time": html.escape(" • " + time_str) if time_str else "",
+            "msg": html.escape(ev.message or ""),
+        }
 
-    if limit is not None and len(events) > limit:
-        events = events[-limit:]
+        if etype == "tool":
+            fields["bg_color"], fields["icon"] = TOOL_STYLES.get(
+                ev.tool_key, DEFAULT_TOOL_STYLE
+            )
+        elif etype == "event":
+            fields["msg"] = html.escape(ev.label or "Event")
+
+        html_parts.append(CHAT_TEMPLATES[etype].format_map(fields))
+
+    usage_parts = [
+        USAGE_TEMPLATE.format(
+            time=html.escape(" • " + ev.time) if ev.time else "",
+            total=ev.total_tokens or "–",
+            input=ev.input_tokens or 0,
+            output=ev.output_tokens or 0,
+            completion_id=html.escape(ev.completion_id or "-"),
+        )
+        for ev in usage_events[-10:]
+    ]
 
-    return events
+    return {
+        "total_events": len(events),
+        "tool_calls": len(tool_events),
+        "total_tokens": usage_events[-1].total_tokens if usage_events else None,
+        "member_messages": len(member_interactions),
+        "chat_html": "".join(html_parts),
+        "usage_html": "".join(usage_parts),
+    }
 
 
 # --------------- STREAMLIT UI ---------------
@@ -254,127 +410,51 @@ if not log_file.exists():
     st.error(f"Log file not found at: `{log_file.resolve()}`")
     st.stop()
 
-events = parse_log_file(str(log_file), limit=MAX_EVENTS)
+events = tail_log_file(str(log_file), st.session_state)
 
 if not events:
     st.warning("No parsed conversation events yet. Member interaction required.")
     st.stop()
 
-usage_events = [e for e in events if e["type"] == "usage"]
-chat_events = [e for e in events if e["type"] in ("user", "assistant", "event", "tool")]
+# Autorefresh reruns this script every few seconds; only rebuild the view
+# when the log has grown or the display settings changed
+tail = st.session_state["log_tail"]
+view_key = (tail["inode"], tail["offset"], show_events)
+view = st.session_state.get("rendered_view")
+if view is None or view["key"] != view_key:
+    view = build_view(events, show_events)
+    view["key"] = view_key
+    st.session_state["rendered_view"] = view
 
 # ---- SUMMARY ----
 st.markdown("### 📊 Session Summary")
 
 cols = st.columns(4)
 with cols[0]:
-    st.metric("Total Events", len(events))
+    st.metric("Total Events", view["total_events"])
 
 with cols[1]:
-    tool_events = [e for e in chat_events if e["type"] == "tool"]
-    st.metric("Tool Calls", len(tool_events))
+    st.metric("Tool Calls", view["tool_calls"])
 
 with cols[2]:
-    latest_usage = usage_events[-1] if usage_events else None
-    if latest_usage:
-        st.metric("Total Tokens", latest_usage.get("total_tokens") or "–")
-    else:
-        st.metric("Total Tokens", "–")
+    st.metric("Total Tokens", view["total_tokens"] or "–")
 
 with cols[3]:
-    member_interactions = [e for e in chat_events if e["type"] == "user"]
-    st.metric("Member Messages", len(member_interactions))
+    st.metric("Member Messages", view["member_messages"])
 
 st.markdown("---")
 
 # ---- MAIN CONVERSATION VIEW ----
 st.markdown("### 💬 Conversation Flow")
 
-for ev in chat_events:
-    etype = ev["type"]
-    time_str = ev.get("time") or ""
-
-    if etype == "user":
-        st.markdown(
-            f"""
-<div style="padding: 10px 14px; margin-bottom: 10px; border-radius: 10px; background-color: #1e3a8a; border-left: 4px solid #3b82f6;">
-  <div style="font-size: 0.75rem; opacity: 0.8; color: #93c5fd;">Member{(" • " + time_str) if time_str else ""}</div>
-  <div style="margin-top: 6px; color: #e0e7ff; font-size: 0.95rem;">{ev['message']}</div>
-</div>
-""",
-            unsafe_allow_html=True,
-        )
-
-    elif etype == "assistant":
-        st.markdown(
-            f"""
-<div style="padding: 10px 14px; margin-bottom: 10px; border-radius: 10px; background-color: #0f172a; border-left: 4px solid #64748b;">
-  <div style="font-size: 0.75rem; opacity: 0.8; color: #94a3b8;">Kiosk Assistant{(" • " + time_str) if time_str else ""}</div>
-  <div style="margin-top: 6px; color: #cbd5e1; font-size: 0.95rem;">{ev['message']}</div>
-</div>
-""",
-            unsafe_allow_html=True,
-        )
-
-    elif etype == "tool":
-        # Highlight different tool types with colors
-        tool_msg = ev['message'].lower()
-        if 'verify' in tool_msg or 'member' in tool_msg:
-            bg_color = "#064e3b"  # Dark green for verification
-            icon = "🔐"
-        elif 'return' in tool_msg:
-            bg_color = "#7c2d12"  # Dark orange for returns
-            icon = "↩️"
-        elif 'transaction' in tool_msg:
-            bg_color = "#831843"  # Dark pink for transaction issues
-            icon = "⚠️"
-        elif 'complaint' in tool_msg:
-            bg_color = "#3f1d38"  # Dark purple for complaints
-            icon = "📝"
-        else:
-            bg_color = "#1e3a8a"  # Default blue
-            icon = "🔧"
-
-        st.markdown(
-            f"""
-<div style="padding: 8px 12px; margin-bottom: 8px; border-radius: 8px; background-color: {bg_color}; border-left: 3px solid rgba(255,255,255,0.3);">
-  <div style="font-size: 0.75rem; opacity: 0.85; color: #d1d5db;">{icon} Tool Execution{(" • " + time_str) if time_str else ""}</div>
-  <div style="font-size: 0.88rem; margin-top: 4px; color: #f3f4f6; font-family: monospace;">{ev['message']}</div>
-</div>
-""",
-            unsafe_allow_html=True,
-        )
-
-    elif etype == "event" and show_events:
-        st.markdown(
-            f"""
-<div style="font-size: 0.72rem; opacity: 0.5; margin: 4px 0; color: #6b7280;">
-  ⚡ Event: {ev.get('label', 'Event')}{(" • " + time_str) if time_str else ""}
-</div>
-""",
-            unsafe_allow_html=True,
-        )
+# One markdown call for the whole conversation instead of one per event
+st.markdown(view["chat_html"], unsafe_allow_html=True)
 
 # ---- USAGE (DROPDOWN) ----
-if usage_events:
+if view["usage_html"]:
     st.markdown("---")
     with st.expander("📈 Token Usage Analytics (last 10 sessions)"):
-        for ev in usage_events[-10:]:
-            time_str = ev.get("time") or ""
-            st.markdown(
-                f"""
-<div style="padding: 8px 12px; margin-bottom: 8px; border-radius: 8px; background-color: #0c1222; border: 1px solid #1e293b;">
-  <div style="font-size: 0.8rem; opacity: 0.7; color: #94a3b8;">Usage Metrics{(" • " + time_str) if time_str else ""}</div>
-  <div style="font-size: 0.88rem; margin-top: 6px; color: #e2e8f0;">
-    <b style="color: #60a5fa;">Total: {ev.get('total_tokens') or '–'} tokens</b><br/>
-    <span style="color: #86efac;">Input: {ev.get('input_tokens') or 0}</span> •
-    <span style="color: #fbbf24;">Output: {ev.get('output_tokens') or 0}</span><br/>
-    <span style="font-size: 0.75rem; opacity: 0.6;">Completion ID: <code>{ev.get('completion_id') or '-'}</code></span>
-  </div>
-</div>
-""",
-                unsafe_allow_html=True,
-            )
+        st.markdown(view["usage_html"], unsafe_allow_html=True)
 
 # ---- FOOTER ----
 st.markdown(
@@ -35,3 +35,6 @@ TOOL_VERIFY_RETURN_ITEM = "verifyreturnitem"
 TOOL_INITIATE_RETURN = "initiatereturn"
 TOOL_PROCESS_TRANSACTION_ISSUE = "processtransactionissue"
 TOOL_FILE_COMPLAINT = "filecomplaint"
+
+# Worker threads for blocking tool execute() calls
+TOOL_EXECUTOR_WORKERS = 8
@@ -4,7 +4,7 @@ Handles all retail member service tools with DynamoDB integration
 """
 import asyncio
 import json
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from config.settings import get_config
 from config.constants import *
 from tools import (
@@ -31,7 +31,6 @@ class RetailToolProcessor:
         Args:
             dynamodb: boto3 DynamoDB resource
         """
-        self.tasks = {}
         self.dynamodb = dynamodb
         config = get_config()
 
@@ -44,6 +43,20 @@ class RetailToolProcessor:
         # Initialize all tool instances
         self.tools = self._initialize_tools()
 
+        # Tool names as sent by the model resolved to instances. Seeded with the
+        # normalized names with and without the schemas' "Tool" suffix; exact
+        # spellings are added as they are first seen.
+        self.tool_lookup = {}
+        for name, tool in self.tools.items():
+            self.tool_lookup[name] = tool
+            self.tool_lookup[name + "tool"] = tool
+
+        # Tool bodies block on DynamoDB, so they run on a dedicated pool sized
+        # to boto3's connection pool rather than the loop's default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="retail-tool"
+        )
+
         try:
             self.loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -92,16 +105,7 @@ class RetailToolProcessor:
         Returns:
             Dictionary containing tool execution results
         """
-        task_id = str(uuid.uuid4())
-        task = asyncio.create_task(self._run_tool(tool_name, tool_content))
-        self.tasks[task_id] = task
-
-        try:
-            result = await task
-            return result
-        finally:
-            if task_id in self.tasks:
-                del self.tasks[task_id]
+        return await self._run_tool(tool_name, tool_content)
 
     async def _run_tool(self, tool_name, tool_content):
         """
@@ -115,9 +119,14 @@ class RetailToolProcessor:
             Dictionary containing tool execution results
         """
         debug_print(f"Processing tool: {tool_name}")
-        
-        # Normalize tool name (lowercase, remove spaces)
-        tool = tool_name.lower().replace(" ", "")
+
+        tool_instance = self.tool_lookup.get(tool_name)
+        if tool_instance is None:
+            # Normalize tool name (lowercase, remove spaces)
+            tool_instance = self.tool_lookup.get(tool_name.lower().replace(" ", ""))
+            if tool_instance is not None:
+                self.tool_lookup[tool_name] = tool_instance
+
         content = tool_content.get("content", {})
 
         # Parse content if it's a JSON string
@@ -129,13 +138,14 @@ class RetailToolProcessor:
         else:
             content_data = content
 
-        # Look up tool instance
-        tool_instance = self.tools.get(tool)
-        
         if tool_instance:
             # Execute tool in thread pool to avoid blocking
             return await self.loop.run_in_executor(
-                None, tool_instance.execute, content_data
+                self._executor, tool_instance.execute, content_data
             )
         else:
             return {"error": f"Unsupported tool: {tool_name}"}
+
+    def close(self):
+        """Release the tool worker threads"""
+        self._executor.shutdown(wait=False)
@@ -54,6 +54,7 @@ async def main(debug=False):
         print("\n\nShutting down retail member service assistant...")
     finally:
         await audio_streamer.stop()
+        tool_processor.close()
 
 
 if __name__ == "__main__":